@@ -0,0 +1,414 @@
+import collections
+import difflib
+import gzip
+import hashlib
+import io
+import json
+import mmap
+import re
+import struct
+import zlib
+from typing import Any, Dict, Iterable, Optional
+
+import discord
+
+tokens = re.compile(r"\s+|\S+")
+
+
+def word_diff(
+    before: str,
+    after: str,
+    *,
+    context: int = 6,
+    window: Optional[int] = 2000,
+    markdown: bool = True,
+) -> str:
+    """
+    Returns a word-level diff of two messages with `context` tokens
+    kept around each change. Common prefixes and suffixes are skipped
+    before diffing and at most `window` tokens of the changed region
+    are compared, so the cost follows the size of the edit.
+
+    Markdown diffs strike out removed text and bold added text, plain
+    diffs use `[-removed-]` and `{+added+}` markers.
+    """
+    old, new = tokens.findall(before), tokens.findall(after)
+    start = 0
+    while start < len(old) and start < len(new) and old[start] == new[start]:
+        start += 1
+
+    end = 0
+    while (
+        end < len(old) - start
+        and end < len(new) - start
+        and old[-1 - end] == new[-1 - end]
+    ):
+        end += 1
+
+    old_changed, new_changed = old[start : len(old) - end], new[start : len(new) - end]
+    truncated = window is not None and (
+        len(old_changed) > window or len(new_changed) > window
+    )
+    if truncated:
+        old_changed, new_changed = old_changed[:window], new_changed[:window]
+
+    escape = discord.utils.escape_markdown if markdown else str
+
+    def removed(text: str) -> str:
+        return f"~~{escape(text)}~~" if markdown else f"[-{text}-]"
+
+    def added(text: str) -> str:
+        return f"**{escape(text)}**" if markdown else f"{{+{text}+}}"
+
+    parts = []
+    if start > context:
+        parts.append("… ")
+    parts.extend(escape(token) for token in old[max(0, start - context) : start])
+
+    matcher = difflib.SequenceMatcher(None, old_changed, new_changed, autojunk=False)
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == "equal":
+            same = old_changed[i1:i2]
+            if len(same) > context * 2:
+                parts.extend(escape(token) for token in same[:context])
+                parts.append(" … ")
+                parts.extend(escape(token) for token in same[-context:])
+            else:
+                parts.extend(escape(token) for token in same)
+
+            continue
+
+        for text, mark in (
+            ("".join(old_changed[i1:i2]), removed),
+            ("".join(new_changed[j1:j2]), added),
+        ):
+            stripped = text.strip()
+            if stripped:
+                parts.append(
+                    text[: len(text) - len(text.lstrip())]
+                    + mark(stripped)
+                    + text[len(text.rstrip()) :]
+                )
+
+    if truncated:
+        parts.append(" …")
+    else:
+        parts.extend(
+            escape(token) for token in old[len(old) - end : len(old) - end + context]
+        )
+        if end > context:
+            parts.append(" …")
+
+    return "".join(parts)
+
+
+class Transcript:
+    """
+    A gzip compressed JSON Lines transcript of deleted messages,
+    written one message at a time.
+    -----------------------------
+
+    messages: :class:`int`
+        How many messages have been written.
+
+    cached: :class:`int`
+        How many of those had their content available.
+    """
+
+    def __init__(self) -> None:
+        self.buffer = io.BytesIO()
+        self.stream = gzip.GzipFile(fileobj=self.buffer, mode="wb")
+        self.messages = 0
+        self.cached = 0
+
+    @staticmethod
+    def record(message: discord.Message) -> Dict[str, Any]:
+        """
+        Returns the parts of a message worth keeping after it is deleted.
+        """
+        return {
+            "id": message.id,
+            "author": str(message.author),
+            "author_id": message.author.id,
+            "created_at": message.created_at.isoformat(),
+            "edited_at": message.edited_at.isoformat() if message.edited_at else None,
+            "content": message.content,
+            "attachments": [attachment.url for attachment in message.attachments],
+            "embeds": len(message.embeds),
+        }
+
+    def write(self, data: Dict[str, Any]) -> None:
+        self.stream.write(json.dumps(data, ensure_ascii=False).encode() + b"\n")
+        self.messages += 1
+
+    def add(self, message: discord.Message) -> None:
+        self.write(self.record(message))
+        self.cached += 1
+
+    def add_record(self, record: "MessageRecord") -> None:
+        """
+        Records a message that is only known from the :class:`MessageStore`.
+        """
+        self.write(
+            {
+                "id": record.id,
+                "author_id": record.author,
+                "created_at": discord.utils.snowflake_time(record.id).isoformat(),
+                "content": record.content,
+            }
+        )
+        self.cached += 1
+
+    def add_missing(self, message_id: int) -> None:
+        """
+        Records a message that was deleted before it could be cached.
+        """
+        self.write(
+            {
+                "id": message_id,
+                "created_at": discord.utils.snowflake_time(message_id).isoformat(),
+                "content": None,
+            }
+        )
+
+    def extend(
+        self,
+        message_ids: Iterable[int],
+        messages: Iterable[discord.Message],
+        store: Optional["MessageStore"] = None,
+    ) -> None:
+        """
+        Writes every deleted message in the order they were sent, looking
+        up uncached messages in `store` and falling back to only the id.
+        """
+        cached = {message.id: message for message in messages}
+        for message_id in sorted(message_ids):
+            message: Optional[discord.Message] = cached.get(message_id)
+            record = None if message or store is None else store.get(message_id)
+            if message:
+                self.add(message)
+            elif record:
+                self.add_record(record)
+            else:
+                self.add_missing(message_id)
+
+    def file(self, filename: str) -> discord.File:
+        """
+        Finishes the transcript and returns it as an attachment.
+        """
+        self.stream.close()
+        self.buffer.seek(0)
+        return discord.File(self.buffer, filename=filename)
+
+
+class MessageRecord:
+    """
+    The parts of a message kept for edit and delete logs.
+    -----------------------------
+
+    digest: :class:`bytes`
+        A blake2b hash of the full content, used to tell content
+        edits apart from embed or pin updates.
+
+    blob: :class:`bytes`
+        The zlib compressed content. Very long messages may be
+        truncated to fit a ring file slot.
+    """
+
+    __slots__ = ("id", "guild", "channel", "author", "digest", "blob")
+
+    def __init__(
+        self,
+        id: int,
+        guild: int,
+        channel: int,
+        author: int,
+        digest: bytes,
+        blob: bytes,
+    ) -> None:
+        self.id = id
+        self.guild = guild
+        self.channel = channel
+        self.author = author
+        self.digest = digest
+        self.blob = blob
+
+    @staticmethod
+    def hash(content: str) -> bytes:
+        return hashlib.blake2b(content.encode(), digest_size=16).digest()
+
+    @classmethod
+    def create(
+        cls, id: int, guild: int, channel: int, author: int, content: str
+    ) -> "MessageRecord":
+        return cls(
+            id,
+            guild,
+            channel,
+            author,
+            cls.hash(content),
+            zlib.compress(content.encode()),
+        )
+
+    @classmethod
+    def from_message(cls, message: discord.Message) -> "MessageRecord":
+        return cls.create(
+            message.id,
+            message.guild.id,
+            message.channel.id,
+            message.author.id,
+            message.content,
+        )
+
+    @property
+    def content(self) -> str:
+        return zlib.decompress(self.blob).decode(errors="replace")
+
+
+class MessageStore:
+    """
+    A size-capped store of recent messages backed by a memory-mapped
+    ring file, so edit and delete logs keep working across restarts.
+    -----------------------------
+
+    The file is split into `slots` fixed-size slots that are overwritten
+    oldest first. Only an id to slot index and the `cache_size` most
+    recently used records are held in memory.
+    """
+
+    magic = b"SYNMSG01"
+    header = struct.Struct("<8sQ")
+    record = struct.Struct("<QQQQ16sH")
+
+    def __init__(
+        self,
+        path: str = "messages.ring",
+        *,
+        slots: int = 16384,
+        slot_size: int = 1024,
+        cache_size: int = 2048,
+    ) -> None:
+        self.path = path
+        self.slot_size = slot_size
+        self.cache_size = cache_size
+        self.cache: collections.OrderedDict[int, MessageRecord] = (
+            collections.OrderedDict()
+        )
+        self.index: Dict[int, int] = {}
+
+        size = self.header.size + slots * slot_size
+        with open(path, "ab") as file:
+            if file.tell() != size:
+                file.truncate(size)
+                fresh = True
+            else:
+                fresh = False
+
+        self.file = open(path, "r+b")
+        self.map = mmap.mmap(self.file.fileno(), size)
+        self.slots = slots
+
+        magic, cursor = self.header.unpack_from(self.map, 0)
+        if fresh or magic != self.magic or cursor >= slots:
+            self.map[:] = bytes(size)
+            self.header.pack_into(self.map, 0, self.magic, 0)
+            cursor = 0
+
+        self.cursor = cursor
+        for slot in range(slots):
+            (message_id,) = struct.unpack_from("<Q", self.map, self.offset(slot))
+            if message_id:
+                self.index[message_id] = slot
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def offset(self, slot: int) -> int:
+        return self.header.size + slot * self.slot_size
+
+    def remember(self, record: MessageRecord) -> None:
+        self.cache[record.id] = record
+        self.cache.move_to_end(record.id)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def put(self, record: MessageRecord) -> None:
+        """
+        Writes a record to its existing slot, or the oldest one.
+        """
+        slot = self.index.get(record.id)
+        if slot is None:
+            slot = self.cursor
+            self.cursor = (self.cursor + 1) % self.slots
+            offset = self.offset(slot)
+            (evicted,) = struct.unpack_from("<Q", self.map, offset)
+            if evicted:
+                self.index.pop(evicted, None)
+                self.cache.pop(evicted, None)
+
+            self.header.pack_into(self.map, 0, self.magic, self.cursor)
+
+        blob = record.blob
+        room = self.slot_size - self.record.size
+        if len(blob) > room:
+            content = record.content
+            while len(blob) > room:
+                content = content[: len(content) * 3 // 4]
+                blob = zlib.compress(content.encode())
+            record.blob = blob
+
+        offset = self.offset(slot)
+        self.record.pack_into(
+            self.map,
+            offset,
+            record.id,
+            record.guild,
+            record.channel,
+            record.author,
+            record.digest,
+            len(blob),
+        )
+        start = offset + self.record.size
+        self.map[start : start + len(blob)] = blob
+        self.index[record.id] = slot
+        self.remember(record)
+
+    def get(self, message_id: int) -> Optional[MessageRecord]:
+        record = self.cache.get(message_id)
+        if record is not None:
+            self.cache.move_to_end(message_id)
+            return record
+
+        slot = self.index.get(message_id)
+        if slot is None:
+            return None
+
+        offset = self.offset(slot)
+        stored, guild, channel, author, digest, length = self.record.unpack_from(
+            self.map, offset
+        )
+        if stored != message_id:
+            self.index.pop(message_id, None)
+            return None
+
+        start = offset + self.record.size
+        record = MessageRecord(
+            stored,
+            guild,
+            channel,
+            author,
+            digest,
+            bytes(self.map[start : start + length]),
+        )
+        self.remember(record)
+        return record
+
+    def add(self, message: discord.Message) -> MessageRecord:
+        record = MessageRecord.from_message(message)
+        self.put(record)
+        return record
+
+    def close(self) -> None:
+        self.map.flush()
+        self.map.close()
+        self.file.close()
@@ -0,0 +1,51 @@
+"""
+Compares :func:`utils.classify_url` against the regex scan it replaced.
+
+    python benchmarks/urls.py
+"""
+
+import os
+import re
+import sys
+import timeit
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+sys.path.insert(0, os.path.join(root, "tests"))
+
+from test_urls import urls  # noqa: E402
+from utils import classify_url  # noqa: E402
+
+youtube_regex = re.compile(
+    r"[&?]list=([^&]+)?|((?:youtube\.com|youtu.be))(\/(?:[\w\-]+\?v=|embed\/|v\/)?)([\w\-]+)(\S+)?"
+)
+spotify_regex = re.compile(
+    r"https?://open.spotify.com/(?P<type>album|playlist|track)/(?P<id>[a-zA-Z0-9]+)"
+)
+soundcloud_regex = re.compile(
+    r"^(?:(https?):\/\/)?(?:(?:www|m)\.)?(soundcloud\.com|snd\.sc)\/(.*)([&?]si=([^&]+))$"
+)
+
+arguments = [argument for argument, _ in urls]
+
+
+def regex() -> None:
+    for argument in arguments:
+        youtube = youtube_regex.findall(argument)
+        spotify_regex.findall(argument)
+        soundcloud_regex.findall(argument)
+        if youtube:
+            matches = tuple(match for match in youtube[0] if match)
+            [match for match in matches if "&list=" in match]
+
+
+def classify() -> None:
+    for argument in arguments:
+        classify_url(argument)
+
+
+if __name__ == "__main__":
+    number = 2000
+    for name, function in (("regex", regex), ("classify_url", classify)):
+        best = min(timeit.repeat(function, number=number, repeat=5))
+        print(f"{name}: {best / number / len(arguments) * 1e6:.2f}us per url")
@@ -1,3 +1,4 @@
+import datetime
 from typing import List
 
 import discord
@@ -108,6 +109,47 @@ class Developer(commands.Cog, command_attrs=dict(hidden=True, slash_command=Fals
         )
         await context.send(embed=embed)
 
+    @commands.command()
+    @commands.is_owner()
+    async def trackcache(self, context: commands.Context) -> None:
+        """
+        Shows how often track lookups are served from the cache.
+        """
+        cache = context.bot.track_cache
+        embed: discord.Embed = context.bot.embed(
+            description=f"Hits: {cache.hits}\nMisses: {cache.misses}\nHit rate: {cache.hit_rate:.1%}\nCached tracks: {len(cache.entries)}/{cache.maxsize}",
+            color=0x006CCB,
+        )
+        await context.send(embed=embed)
+
+    @commands.command()
+    @commands.is_owner()
+    async def players(self, context: commands.Context) -> None:
+        """
+        Shows the resources used by each music player.
+        """
+        now = discord.utils.utcnow()
+        lines = []
+        for node in context.bot.nodes:
+            for player in node.players:
+                active = datetime.timedelta(
+                    seconds=int((now - player.created_at).total_seconds())
+                )
+                idle = (
+                    f" | idle {discord.utils.format_dt(player.idle_since, 'R')}"
+                    if player.idle_since
+                    else ""
+                )
+                lines.append(
+                    f"**{player.guild}** ({node.identifier}): {active} active | {player.tracks_played} tracks | {player.bytes_streamed / 1024 ** 2:.1f} MiB{idle}"
+                )
+
+        embed: discord.Embed = context.bot.embed(
+            description="\n".join(lines) or "No active players.",
+            color=0x006CCB,
+        )
+        await context.send(embed=embed)
+
     @commands.command()
     @commands.is_owner()
     async def shutdown(self, context: commands.Context) -> None:
@@ -1,10 +1,24 @@
 import asyncio
+import collections
 import datetime
+import io
 from typing import List, Optional, Union
 
 import discord
 from discord.ext import commands, tasks
 
+from archive import MessageRecord, MessageStore, Transcript, word_diff
+from utils import (
+    JoinIndex,
+    LogEvent,
+    MessageTemplate,
+    diff_ids,
+    diff_overwrites,
+    diff_permissions,
+    overwrite_pairs,
+    permission_names,
+)
+
 
 class Events(commands.Cog):
     """
@@ -12,11 +26,43 @@ class Events(commands.Cog):
     all incoming events.
     """
 
+    edit_diff_limit = 3500
+    audit_log_limit = 50
+    audit_log_slack = datetime.timedelta(seconds=30)
+
     def __init__(self, bot):
         self.bot = bot
         self.embeds = {}
         self.logs = {}
         self.webhooks = {}
+        self.attributions: collections.defaultdict[
+            int,
+            list[
+                tuple[
+                    tuple[discord.AuditLogAction, ...],
+                    int,
+                    discord.Embed,
+                    datetime.datetime,
+                ]
+            ],
+        ] = collections.defaultdict(list)
+        self.presences: dict[tuple[int, int], tuple[discord.Member, asyncio.Task]] = {}
+        self.presence_window = self.bot.config.getfloat(
+            "EVENTS", "presence_window", fallback=30.0
+        )
+        self.messages = MessageStore(
+            self.bot.config.get("EVENTS", "message_store", fallback="messages.ring"),
+            slots=self.bot.config.getint("EVENTS", "message_slots", fallback=16384),
+        )
+        self.member_guilds: collections.defaultdict[int, set[int]] = (
+            collections.defaultdict(set)
+        )
+        self.joins = JoinIndex()
+        self.member_messages: dict[
+            tuple[int, str], Optional[tuple[int, MessageTemplate]]
+        ] = {}
+        if self.bot.is_ready():
+            self.index_members(*self.bot.guilds)
 
         self.bot.loop.create_task(self.__ainit__())
 
@@ -36,6 +82,9 @@ class Events(commands.Cog):
         close after finishing final iteration.
         """
         self.dispatch_events.stop()
+        for _, task in self.presences.values():
+            task.cancel()
+        self.messages.close()
         super().cog_unload()
 
     @tasks.loop(seconds=10, reconnect=True)
@@ -48,25 +97,96 @@ class Events(commands.Cog):
         pending outgoing events and dispatches them.
         """
         if len(self.embeds) >= 1:
-            for guild in iter(self.embeds):
+            for guild in list(self.embeds):
+                webhook: discord.Webhook = self.embeds[guild]["webhook"]
+                if not webhook:
+                    continue
+
+                if guild in self.attributions:
+                    await self.correlate(guild)
+
                 if len(self.embeds[guild]["embeds"]) > 0:
-                    webhook: discord.Webhook = self.embeds[guild]["webhook"]
                     embeds: List[discord.Embed] = self.embeds[guild]["embeds"][:10]
-                    if webhook:
-                        try:
+                    try:
+                        await webhook.send(
+                            embeds=embeds,
+                            avatar_url=self.bot.user.display_avatar.url,
+                        )
+                    except discord.HTTPException:
+                        for embed in embeds:
                             await webhook.send(
-                                embeds=embeds,
+                                embed=embed,
                                 avatar_url=self.bot.user.display_avatar.url,
                             )
-                        except discord.HTTPException:
-                            for embed in embeds:
-                                await webhook.send(
-                                    embed=embed,
-                                    avatar_url=self.bot.user.display_avatar.url,
-                                )
-                                await asyncio.sleep(1)
+                            await asyncio.sleep(1)
+
+                    del self.embeds[guild]["embeds"][:10]
+
+                files = self.embeds[guild].get("files")
+                while files:
+                    embed, file = files.pop(0)
+                    try:
+                        await webhook.send(
+                            embed=embed,
+                            file=file,
+                            avatar_url=self.bot.user.display_avatar.url,
+                        )
+                    except discord.HTTPException:
+                        pass
+
+    def attribute(
+        self,
+        guild: int,
+        actions: tuple[discord.AuditLogAction, ...],
+        target: int,
+        embed: discord.Embed,
+    ) -> None:
+        """
+        Marks a queued embed to be credited to whoever performed one of
+        `actions` on `target`, once the guild's audit log is fetched.
+        """
+        self.attributions[guild].append(
+            (actions, target, embed, discord.utils.utcnow())
+        )
+
+    async def correlate(self, guild: int) -> None:
+        """
+        |coro|
+
+        Fetches the guild's recent audit log entries in one request and
+        adds the responsible user to every pending embed they match.
+        """
+        pending = self.attributions.pop(guild, None)
+        server = self.bot.get_guild(guild)
+        if not pending or server is None:
+            return
 
-                        del self.embeds[guild]["embeds"][:10]
+        if not server.me.guild_permissions.view_audit_log:
+            return
+
+        entries = {}
+        try:
+            async for entry in server.audit_logs(limit=self.audit_log_limit):
+                key = (entry.action, getattr(entry.target, "id", None))
+                entries.setdefault(key, entry)
+        except discord.HTTPException:
+            return
+
+        for actions, target, embed, queued in pending:
+            matches = [
+                entries[(action, target)]
+                for action in actions
+                if (action, target) in entries
+                and entries[(action, target)].created_at
+                >= queued - self.audit_log_slack
+            ]
+            if not matches:
+                continue
+
+            entry = max(matches, key=lambda entry: entry.id)
+            embed.add_field(name="Responsible", value=entry.user.mention)
+            if entry.reason:
+                embed.add_field(name="Reason", value=entry.reason[:1024])
 
     async def prepare_webhook(self, channel: discord.TextChannel) -> discord.Webhook:
         """
@@ -92,55 +212,150 @@ class Events(commands.Cog):
         except (discord.Forbidden, discord.HTTPException):
             pass
 
-    async def log_channel(self, guild: int) -> Optional[discord.TextChannel]:
+    async def log_channel(
+        self, guild: int, event: LogEvent
+    ) -> Optional[discord.TextChannel]:
         """
         |coro|
 
         Either returns a `TextChannel` or `None` if a server has a
-        channel setup for logging events.
+        channel setup for logging events and has `event` enabled.
+
+        Only the channel id is cached, so a channel that could not be
+        found yet is looked up again on the next call.
         """
-        if not self.logs.get(guild):
-            channel: Optional[int] = await self.bot.pool.fetchval(
-                "SELECT logs FROM guilds WHERE guild = $1", guild
+        if guild not in self.logs:
+            data = await self.bot.pool.fetchrow(
+                "SELECT logs, log_events FROM guilds WHERE guild = $1", guild
             )
-            if channel:
-                log_channel: discord.TextChannel = self.bot.get_channel(channel)
-                self.logs[guild] = log_channel
-                return self.logs[guild]
+            events = (
+                LogEvent(data["log_events"])
+                if data and data["log_events"] is not None
+                else LogEvent.ALL
+            )
+            self.logs[guild] = (data["logs"] if data else None, events)
 
+        channel_id, events = self.logs[guild]
+        if not channel_id or event & events != event:
             return None
 
-        else:
-            return self.logs[guild]
+        channel: Optional[discord.TextChannel] = self.bot.get_channel(channel_id)
+        return channel
+
+    def subscribed(self, guild: int, event: LogEvent) -> bool:
+        """
+        Whether `event` may be logged for `guild`. Guilds that have not
+        been loaded yet are assumed to be subscribed until
+        :meth:`log_channel` has looked them up.
+        """
+        settings = self.logs.get(guild)
+        return settings is None or (
+            settings[0] is not None and event & settings[1] == event
+        )
+
+    def index_members(self, *guilds: discord.Guild) -> None:
+        """
+        Records which of `guilds` each of their members is in.
+        """
+        for guild in guilds:
+            for member in guild.members:
+                self.member_guilds[member.id].add(guild.id)
+
+    def unindex_guild(self, guild: discord.Guild) -> None:
+        """
+        Removes `guild` from the membership index.
+        """
+        for member in guild.members:
+            guilds = self.member_guilds.get(member.id)
+            if guilds is not None:
+                guilds.discard(guild.id)
+                if not guilds:
+                    del self.member_guilds[member.id]
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        self.member_guilds.clear()
+        self.index_members(*self.bot.guilds)
 
     @commands.Cog.listener()
-    async def on_message_delete(self, message: discord.Message) -> None:
+    async def on_guild_available(self, guild: discord.Guild) -> None:
+        self.index_members(guild)
+
+    @staticmethod
+    def overwrite_target(guild: discord.Guild, target: int) -> str:
         """
-        An event called when a message is deleted.
+        Returns a mention for the role or member an overwrite applies to.
         """
-        if not message.author.bot:
-            channel = await self.log_channel(message.guild.id)
-            if channel:
-                webhook = await self.prepare_webhook(channel)
+        if target == guild.id:
+            return "@everyone"
 
-                embed: discord.Embed = self.bot.embed(
-                    description=f"{message.author.mention} deleted a message in {message.channel.mention}:\
-                    \n\n{message.content}",
-                    color=0xE74C3C,
-                )
-                embed.set_author(
-                    name=f"{message.author}", icon_url=message.author.avatar.url
-                )
+        if guild.get_role(target):
+            return f"<@&{target}>"
 
-                if self.embeds.get(message.guild.id, None):
-                    embeds: List[discord.Embed] = self.embeds[message.guild.id][
-                        "embeds"
-                    ].append(embed)
+        return f"<@{target}>"
 
-                    self.embeds[message.guild.id].update(embed=embeds)
-                    return
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message) -> None:
+        """
+        An event called when a message is sent. Messages are only kept
+        in the message store for servers that log message events.
+        """
+        if (
+            message.guild
+            and not message.author.bot
+            and await self.log_channel(message.guild.id, LogEvent.MESSAGES)
+        ):
+            self.messages.add(message)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(
+        self, payload: discord.RawMessageDeleteEvent
+    ) -> None:
+        """
+        An event called when a message is deleted. Messages that are no
+        longer cached are looked up in the persistent message store.
+        """
+        if payload.guild_id is None:
+            return
+
+        message = payload.cached_message
+        if message:
+            if message.author.bot:
+                return
+
+            author, content = message.author, message.content
+        else:
+            record = self.messages.get(payload.message_id)
+            if record is None:
+                return
+
+            guild = self.bot.get_guild(payload.guild_id)
+            author = guild.get_member(record.author) if guild else None
+            content = record.content
+            if author is None:
+                author = discord.Object(record.author)
+
+        channel = await self.log_channel(payload.guild_id, LogEvent.MESSAGES)
+        if channel:
+            webhook = await self.prepare_webhook(channel)
+
+            embed: discord.Embed = self.bot.embed(
+                description=f"<@{author.id}> deleted a message in <#{payload.channel_id}>:\
+                \n\n{content}",
+                color=0xE74C3C,
+            )
+            if isinstance(author, (discord.User, discord.Member)):
+                embed.set_author(name=f"{author}", icon_url=author.display_avatar.url)
+
+            if self.embeds.get(payload.guild_id, None):
+                embeds: List[discord.Embed] = self.embeds[payload.guild_id][
+                    "embeds"
+                ].append(embed)
 
-                self.embeds[message.guild.id] = {"webhook": webhook, "embeds": [embed]}
+                self.embeds[payload.guild_id].update(embed=embeds)
+                return
+
+            self.embeds[payload.guild_id] = {"webhook": webhook, "embeds": [embed]}
 
     @commands.Cog.listener()
     async def on_raw_bulk_message_delete(
@@ -148,113 +363,134 @@ class Events(commands.Cog):
     ) -> None:
         """
         An event called when a bulk amount of messages are deleted.
+        The deleted messages are attached as a compressed transcript.
         """
-        if len(payload.cached_messages) >= 10:
-            channel = await self.log_channel(payload.guild_id)
-            if channel:
-                webhook = await self.prepare_webhook(channel)
-
-                guild: discord.Guild = self.bot.get_guild(payload.guild_id)
+        channel = await self.log_channel(payload.guild_id, LogEvent.MESSAGES)
+        if channel:
+            webhook = await self.prepare_webhook(channel)
 
-                embed: discord.Embed = self.bot.embed(
-                    description=f"{len(payload.cached_messages)} message(s) bulk deleted\
-                    in {guild.get_channel(payload.channel_id).mention}.",
-                    color=0xE74C3C,
-                )
-                embed.set_author(name=str(guild), icon_url=guild.icon.url)
+            guild: discord.Guild = self.bot.get_guild(payload.guild_id)
+            deleted_in = guild.get_channel_or_thread(payload.channel_id)
 
-                if self.embeds.get(payload.guild_id, None):
-                    embeds: List[discord.Embed] = self.embeds[payload.guild_id][
-                        "embeds"
-                    ].append(embed)
+            transcript = Transcript()
+            transcript.extend(
+                payload.message_ids, payload.cached_messages, self.messages
+            )
+            file = transcript.file(
+                f"deleted-{payload.channel_id}-{int(discord.utils.utcnow().timestamp())}.jsonl.gz"
+            )
 
-                    self.embeds[payload.guild_id].update(embed=embeds)
-                    return
+            embed: discord.Embed = self.bot.embed(
+                description=f"{transcript.messages} message(s) bulk deleted in {deleted_in.mention if deleted_in else payload.channel_id}.\n\n{transcript.cached} of them were cached and are included in the attached transcript.",
+                color=0xE74C3C,
+            )
+            embed.set_author(
+                name=str(guild), icon_url=guild.icon.url if guild.icon else None
+            )
 
-                self.embeds[payload.guild_id] = {"webhook": webhook, "embeds": [embed]}
+            queued = self.embeds.setdefault(
+                payload.guild_id, {"webhook": webhook, "embeds": []}
+            )
+            queued.setdefault("files", []).append((embed, file))
 
     @commands.Cog.listener()
-    async def on_message_edit(
-        self, before: discord.Message, after: discord.Message
-    ) -> None:
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent) -> None:
         """
-        An event called when a message has been edited.
+        An event called when a message has been edited. The original
+        content comes from the message cache or the persistent store.
         """
-        if not before.author.bot:
-            channel = await self.log_channel(before.guild.id)
-            if channel:
-                webhook = await self.prepare_webhook(channel)
+        data = payload.data
+        if payload.guild_id is None or "content" not in data:
+            return
 
-                splice = 2000
-                name = str(before.author)
-                avatar = before.author.avatar.url
-
-                embeds = []
-
-                if before.content == after.content:
-                    if (
-                        not before.pinned
-                        and after.pinned
-                        or before.pinned
-                        and not after.pinned
-                    ):
-                        return
-
-                elif len(before.content + after.content) >= 4000:
-                    large_edits = []
-                    total = len(before.content) / splice
-                    for index, slice in enumerate(
-                        range(0, len(before.content), splice), start=1
-                    ):
-                        embed: discord.Embed = self.bot.embed(
-                            description=f"{before.author.mention} edited a message in {before.channel.mention}:\
-                            \n\nOriginal ({index}/{int(total)}):\n{before.content[slice:slice + splice]}",
-                            color=0xE67E22,
-                        )
-                        embed.set_author(name=name, icon_url=avatar)
-
-                        large_edits.append(embed)
-
-                    total = len(after.content) / splice
-                    for index, slice in enumerate(
-                        range(0, len(after.content), splice), start=1
-                    ):
-                        embed: discord.Embed = self.bot.embed(
-                            description=f"{before.author.mention} edited a message in {before.channel.mention}:\
-                            \n\nEdited ({index}/{int(total)}):\n{after.content[slice:slice + splice]}",
-                            color=0xE67E22,
-                        )
-                        embed.set_author(name=name, icon_url=avatar)
+        author = data.get("author") or {}
+        if author.get("bot") or "id" not in author:
+            return
 
-                        large_edits.append(embed)
+        edited = MessageRecord.create(
+            payload.message_id,
+            payload.guild_id,
+            payload.channel_id,
+            int(author["id"]),
+            data["content"],
+        )
+        record = self.messages.get(payload.message_id)
+        if payload.cached_message:
+            original = payload.cached_message.content
+        elif record:
+            if record.digest == edited.digest:
+                return
 
-                    embeds.extend(large_edits)
+            original = record.content
+        else:
+            original = None
+
+        if await self.log_channel(payload.guild_id, LogEvent.MESSAGES):
+            self.messages.put(edited)
+
+        if original is None or original == data["content"]:
+            return
+
+        guild = self.bot.get_guild(payload.guild_id)
+        member = guild.get_member(edited.author) if guild else None
+        await self.log_edit(
+            payload.guild_id,
+            payload.channel_id,
+            payload.message_id,
+            member or discord.Object(edited.author),
+            original,
+            data["content"],
+        )
 
-                elif len(before.content + after.content) <= 4000:
-                    embed: discord.Embed = self.bot.embed(
-                        description=f"{before.author.mention} edited a message in {before.channel.mention}:\
-                        \n\nOriginal:\n{before.content}\n\nEdited:\n{after.content}",
-                        color=0xE67E22,
-                    )
-                    embed.set_author(name=name, icon_url=avatar)
+    async def log_edit(
+        self,
+        guild: int,
+        channel_id: int,
+        message_id: int,
+        author: Union[discord.Member, discord.Object],
+        before: str,
+        after: str,
+    ) -> None:
+        """
+        |coro|
 
-                    embeds.append(embed)
+        Queues a word-level diff of an edited message, attaching
+        it as a file when it is too long for an embed.
+        """
+        channel = await self.log_channel(guild, LogEvent.MESSAGES)
+        if channel:
+            webhook = await self.prepare_webhook(channel)
 
-                if self.embeds.get(before.guild.id, None):
-                    embed: discord.Embed = self.embeds[before.guild.id]["embeds"]
-                    embed.extend(embeds)
+            diff = word_diff(before, after)
+            file = None
+            if len(diff) > self.edit_diff_limit:
+                file = discord.File(
+                    io.BytesIO(
+                        word_diff(before, after, window=None, markdown=False).encode()
+                    ),
+                    filename=f"edit-{message_id}.diff",
+                )
+                diff = "The changes are too long to show here, see the attached diff."
 
-                    self.embeds[before.guild.id].update(embed=embed)
-                    return
+            embed: discord.Embed = self.bot.embed(
+                description=f"<@{author.id}> edited a message in <#{channel_id}>:\n\n{diff}",
+                color=0xE67E22,
+            )
+            if isinstance(author, discord.Member):
+                embed.set_author(name=str(author), icon_url=author.display_avatar.url)
 
-                self.embeds[before.guild.id] = {"webhook": webhook, "embeds": embeds}
+            queued = self.embeds.setdefault(guild, {"webhook": webhook, "embeds": []})
+            if file:
+                queued.setdefault("files", []).append((embed, file))
+            else:
+                queued["embeds"].append(embed)
 
     @commands.Cog.listener()
     async def on_guild_channel_create(self, channel: discord.abc.GuildChannel) -> None:
         """
         An event called when a channel has been created.
         """
-        log_channel = await self.log_channel(channel.guild.id)
+        log_channel = await self.log_channel(channel.guild.id, LogEvent.CHANNELS)
         if log_channel:
             webhook = await self.prepare_webhook(log_channel)
 
@@ -264,6 +500,13 @@ class Events(commands.Cog):
             )
             embed.set_author(name=f"{channel.guild}", icon_url=channel.guild.icon.url)
 
+            self.attribute(
+                channel.guild.id,
+                (discord.AuditLogAction.channel_create,),
+                channel.id,
+                embed,
+            )
+
             if self.embeds.get(channel.guild.id, None):
                 embeds: List[discord.Embed] = self.embeds[channel.guild.id][
                     "embeds"
@@ -279,7 +522,7 @@ class Events(commands.Cog):
         """
         An event called when a channel has been deleted.
         """
-        log_channel = await self.log_channel(channel.guild.id)
+        log_channel = await self.log_channel(channel.guild.id, LogEvent.CHANNELS)
         if log_channel:
             webhook = await self.prepare_webhook(log_channel)
 
@@ -289,6 +532,13 @@ class Events(commands.Cog):
             )
             embed.set_author(name=f"{channel.guild}", icon_url=channel.guild.icon.url)
 
+            self.attribute(
+                channel.guild.id,
+                (discord.AuditLogAction.channel_delete,),
+                channel.id,
+                embed,
+            )
+
             if self.embeds.get(channel.guild.id, None):
                 embeds: List[discord.Embed] = self.embeds[channel.guild.id][
                     "embeds"
@@ -306,90 +556,51 @@ class Events(commands.Cog):
         """
         An event called whenever a channel is updated.
         """
-        channel = await self.log_channel(before.guild.id)
-        if channel:
-            webhook = await self.prepare_webhook(channel)
-
-            changes = None
-
-            before_overwrites: dict[int, discord.PermissionOverwrite] = {
-                role.id: dict(overwrite)
-                for role, overwrite in before.overwrites.items()
-            }
-            after_overwrites: dict[int, discord.PermissionOverwrite] = {
-                role.id: dict(overwrite) for role, overwrite in after.overwrites.items()
-            }
-
-            role = []
-            enabled = []
-            defaulted = []
-            disabled = []
-
-            for before_role, after_role in zip(
-                iter(before_overwrites), iter(after_overwrites)
-            ):
-                if before_role not in after_overwrites.keys():
-                    changes = f"Permissions: Special permissions removed for <@&{before_role}>"
-                    break
-
-                elif before_role in after_overwrites.keys():
-                    for before_overwrite, after_overwrite in zip(
-                        before_overwrites[before_role].items(),
-                        after_overwrites[after_role].items(),
-                    ):
-                        before_keys, before_value = before_overwrite
-                        after_keys, after_value = after_overwrite
-
-                        if before_value != after_value:
-                            permission = {
-                                True: "Enabled",
-                                False: "Disabled",
-                                None: "Defaulted",
-                            }
-
-                            after_key = (
-                                after_keys.replace("_", " ")
-                                .replace("guild", "server")
-                                .title()
-                            )
-
-                            if not role.count(f"<@&{before_role}>"):
-                                if before_role == before.guild.default_role.id:
-                                    if not role.count("@everyone"):
-                                        role.append("@everyone")
-
-                                else:
-                                    role.append(f"<@&{before_role}>")
-
-                            if permission[after_value] == "Enabled":
-                                enabled.append(after_key)
-
-                            elif permission[after_value] == "Disabled":
-                                disabled.append(after_key)
-
-                            elif permission[after_value] == "Defaulted":
-                                defaulted.append(after_key)
+        if not self.subscribed(before.guild.id, LogEvent.CHANNELS):
+            return
 
-            if enabled or defaulted or disabled:
-                enables = "Enabled: " + ", ".join(enabled) + "\n"
-                disables = "Disabled: " + ", ".join(disabled) + "\n"
-                defaults = "Defaulted: " + ", ".join(defaulted) + "\n"
+        changes = None
+        role = []
 
-                results = f"{enables if enabled else ''}\
-                            {disables if disabled else ''}\
-                            {defaults if defaulted else ''}"
-
-                changes = (
-                    f"Permission(s) updated for ({len(role)}) role(s):\n\n{results}"
-                )
+        added, removed, changed = diff_overwrites(
+            overwrite_pairs(before), overwrite_pairs(after)
+        )
+        if removed or changed:
+            results = [
+                f"Special permissions removed for {self.overwrite_target(before.guild, target)}"
+                for target in removed
+            ]
+            for diff in changed:
+                mention = self.overwrite_target(before.guild, diff.target)
+                role.append(mention)
+                lines = [f"{mention}{' (added)' if diff.target in added else ''}"]
+                for label, bits in (
+                    ("Enabled", diff.enabled),
+                    ("Disabled", diff.disabled),
+                    ("Defaulted", diff.defaulted),
+                ):
+                    if bits:
+                        lines.append(f"{label}: {', '.join(permission_names(bits))}")
+
+                results.append("\n".join(lines))
+
+            results = "\n\n".join(results)
+            changes = f"Permission(s) updated for ({len(removed) + len(changed)}) role(s):\n\n{results}"
+
+        elif before.name != after.name:
+            changes = f"Name: {before.name} -> {after.name}"
+
+        elif before.category != after.category:
+            changes = (
+                f"Category: {before.category or 'N/A'} -> {after.category or 'N/A'}"
+            )
 
-            elif before.name != after.name:
-                changes = f"Name: {before.name} -> {after.name}"
+        if not changes:
+            return
 
-            elif before.category != after.category:
-                changes = (
-                    f"Category: {before.category or 'N/A'} -> {after.category or 'N/A'}"
-                )
+        channel = await self.log_channel(before.guild.id, LogEvent.CHANNELS)
+        if channel:
+            webhook = await self.prepare_webhook(channel)
 
             embed: discord.Embed = self.bot.embed(
                 description=f"{str(after.type).title()} channel\
@@ -404,16 +615,27 @@ class Events(commands.Cog):
                     name=f"({len(role)}) role(s) updated", value=joined_roles
                 )
 
-            if changes:
-                if self.embeds.get(before.guild.id, None):
-                    embeds: List[discord.Embed] = self.embeds[before.guild.id][
-                        "embeds"
-                    ].append(embed)
+            self.attribute(
+                before.guild.id,
+                (
+                    discord.AuditLogAction.channel_update,
+                    discord.AuditLogAction.overwrite_create,
+                    discord.AuditLogAction.overwrite_update,
+                    discord.AuditLogAction.overwrite_delete,
+                ),
+                before.id,
+                embed,
+            )
 
-                    self.embeds[before.guild.id].update(embed=embeds)
-                    return
+            if self.embeds.get(before.guild.id, None):
+                embeds: List[discord.Embed] = self.embeds[before.guild.id][
+                    "embeds"
+                ].append(embed)
 
-                self.embeds[before.guild.id] = {"webhook": webhook, "embeds": [embed]}
+                self.embeds[before.guild.id].update(embed=embeds)
+                return
+
+            self.embeds[before.guild.id] = {"webhook": webhook, "embeds": [embed]}
 
     @commands.Cog.listener()
     async def on_guild_channel_pins_update(
@@ -424,7 +646,7 @@ class Events(commands.Cog):
         """
         An event called when a message was pinned/unpinned.
         """
-        log_channel = await self.log_channel(channel.guild.id)
+        log_channel = await self.log_channel(channel.guild.id, LogEvent.MESSAGES)
         if log_channel:
             webhook = await self.prepare_webhook(log_channel)
 
@@ -450,7 +672,7 @@ class Events(commands.Cog):
         """
         An event called when a thread was created/joined.
         """
-        log_channel = await self.log_channel(thread.guild.id)
+        log_channel = await self.log_channel(thread.guild.id, LogEvent.THREADS)
         if log_channel:
             webhook = await self.prepare_webhook(log_channel)
 
@@ -483,7 +705,7 @@ class Events(commands.Cog):
         """
         An event called when a thread was deleted.
         """
-        log_channel = await self.log_channel(thread.guild.id)
+        log_channel = await self.log_channel(thread.guild.id, LogEvent.THREADS)
         if log_channel:
             webhook = await self.prepare_webhook(log_channel)
 
@@ -509,7 +731,7 @@ class Events(commands.Cog):
         """
         An event called when a thread has been updated.
         """
-        log_channel = await self.log_channel(before.guild.id)
+        log_channel = await self.log_channel(before.guild.id, LogEvent.THREADS)
         if log_channel:
             webhook = await self.prepare_webhook(log_channel)
 
@@ -542,84 +764,91 @@ class Events(commands.Cog):
                 self.embeds[before.guild.id] = {"webhook": webhook, "embeds": [embed]}
 
     # Requires member intents
-    async def on_member_parsing(
-        self, channel: discord.abc.GuildChannel, member: discord.Member, message: str
+    def on_member_parsing(
+        self,
+        channel: discord.abc.GuildChannel,
+        member: discord.Member,
+        message: MessageTemplate,
     ) -> str:
         """
-        |coro|
-
         Returns a formatted string for custom messages in `on_member_x` events.
         """
-        return message.format(
-            user=member.mention,
-            user_id=member.id,
-            user_name=member.name,
-            user_discriminator=member.discriminator,
-            user_avatar=member.avatar.url,
-            server=member.guild.name,
-            server_id=member.guild.id,
-            server_icon=member.guild.icon.url,
-            server_owner_id=member.guild.owner.id,
-            server_owner=member.guild.owner.mention,
-            server_region=member.guild.region,
-            server_members=member.guild.member_count,
-            channel=channel.mention,
-            channel_name=channel.name,
-            channel_id=channel.id,
-            user_bot=member.bot,
-            server_verification=member.guild.verification_level,
-            server_joined_at=member.guild.me.joined_at.strftime("%b. %d, %Y"),
-            channel_type=channel.type[0],
-            user_position=sum(
-                user.joined_at < member.joined_at
-                for user in member.guild.members
-                if member.joined_at is not None
-            )
-            + 1,
-            server_created_at=member.guild.created_at.strftime("%b. %d"),
-            user_created_at=member.created_at.strftime("%b. %d"),
+        guild = member.guild
+        return message.render(
+            {
+                "user": lambda: member.mention,
+                "user_id": lambda: member.id,
+                "user_name": lambda: member.name,
+                "user_discriminator": lambda: member.discriminator,
+                "user_avatar": lambda: member.display_avatar.url,
+                "server": lambda: guild.name,
+                "server_id": lambda: guild.id,
+                "server_icon": lambda: guild.icon.url if guild.icon else "",
+                "server_owner_id": lambda: guild.owner_id,
+                "server_owner": lambda: f"<@{guild.owner_id}>",
+                "server_region": lambda: guild.region,
+                "server_members": lambda: guild.member_count,
+                "channel": lambda: channel.mention,
+                "channel_name": lambda: channel.name,
+                "channel_id": lambda: channel.id,
+                "user_bot": lambda: member.bot,
+                "server_verification": lambda: guild.verification_level,
+                "server_joined_at": lambda: guild.me.joined_at.strftime("%b. %d, %Y"),
+                "channel_type": lambda: channel.type[0],
+                "user_position": lambda: self.joins.position(member),
+                "server_created_at": lambda: guild.created_at.strftime("%b. %d"),
+                "user_created_at": lambda: member.created_at.strftime("%b. %d"),
+            }
         )
 
+    async def member_message(
+        self, event: str, guild: discord.Guild
+    ) -> Optional[tuple[int, MessageTemplate]]:
+        """
+        |coro|
+
+        Returns the channel id and compiled message for `join` or
+        `leave` events, loading them from the database once per guild.
+        """
+        key = (guild.id, event)
+        if key not in self.member_messages:
+            if event == "join":
+                data = await self.bot.pool.fetchrow(
+                    "SELECT joins, welcome FROM guilds WHERE guild = $1", guild.id
+                )
+            else:
+                data = await self.bot.pool.fetchrow(
+                    "SELECT leave, goodbye FROM guilds WHERE guild = $1", guild.id
+                )
+
+            message = None
+            if data and data[0] and data[1]:
+                try:
+                    message = (data[0], MessageTemplate(data[1]))
+                except commands.BadArgument:
+                    pass
+
+            self.member_messages[key] = message
+
+        return self.member_messages[key]
+
     # Requires member intents
     async def member_channel(
         self, event: str, guild: discord.Guild, member: discord.Member
-    ):
-        # Optional[tuple[discord.TextChannel, str]] apparently raises an error?
-        # Will look into this soon but works regardless
+    ) -> tuple[Optional[discord.TextChannel], Optional[str]]:
         """
         |coro|
 
         A method that attempts to locate a :class:`discord.TextChannel` for `join` and
-        `remove` events. If found, channel and message parsing will be completed.
+        `leave` events. If found, channel and message parsing will be completed.
         """
-        if event == "join":
-            join: List = await self.bot.pool.fetch(
-                "SELECT joins, welcome FROM guilds WHERE guild = $1", guild.id
-            )
-            if join:
-                data: List = join[0]
-                channel: discord.TextChannel = guild.get_channel(data[7])
-                if channel:
-                    join_message = await self.on_member_parsing(
-                        channel, member, data[9]
-                    )
-                    return channel, join_message
-
-        elif event == "leave":
-            leave: List = await self.bot.pool.fetch(
-                "SELECT leave, goodbye FROM guilds WHERE guild = $1", guild.id
-            )
-            if leave:
-                data: List = leave[0]
-                channel: discord.TextChannel = guild.get_channel(data[8])
-                if channel:
-                    leave_message = await self.on_member_parsing(
-                        channel, member, data[10]
-                    )
-                    return channel, leave_message
+        message = await self.member_message(event, guild)
+        if message:
+            channel: discord.TextChannel = guild.get_channel(message[0])
+            if channel:
+                return channel, self.on_member_parsing(channel, member, message[1])
 
-        else:
-            return None
+        return None, None
 
     # Requires member intents
     @commands.Cog.listener()
@@ -627,17 +856,20 @@ class Events(commands.Cog):
         """
         An event called whenever a member joins a server.
         """
-        log_channel = await self.log_channel(member.guild.id)
+        self.member_guilds[member.id].add(member.guild.id)
+        self.joins.add(member)
+
+        channel, text = await self.member_channel("join", member.guild, member)
+        if channel:
+            embed: discord.Embed = self.bot.embed(description=text, color=0x3498DB)
+            embed.set_author(name=str(member), icon_url=member.display_avatar.url)
+            embed.set_thumbnail(url=member.display_avatar.url)
+            await channel.send(embed=embed)
+
+        log_channel = await self.log_channel(member.guild.id, LogEvent.MEMBERS)
         if log_channel:
             webhook = await self.prepare_webhook(log_channel)
 
-            channel, text = await self.member_channel("join", member.guild, member)
-            if channel:
-                embed: discord.Embed = self.bot.embed(description=text, color=0x3498DB)
-                embed.set_author(name=str(member), icon_url=member.avatar.url)
-                embed.set_thumbnail(url=member.avatar.url)
-                await channel.send(embed=embed)
-
             embed: discord.Embed = self.bot.embed(
                 description=f"{member} has joined {member.guild}", color=0x2ECC71
             )
@@ -656,22 +888,34 @@ class Events(commands.Cog):
     # Requires member intents
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member) -> None:
-        log_channel = await self.log_channel(member.guild.id)
+        guilds = self.member_guilds.get(member.id)
+        if guilds is not None:
+            guilds.discard(member.guild.id)
+            if not guilds:
+                del self.member_guilds[member.id]
+
+        self.joins.remove(member)
+
+        leave, text = await self.member_channel("leave", member.guild, member)
+        if leave:
+            embed: discord.Embed = self.bot.embed(description=text, color=0x3498DB)
+            embed.set_author(name=str(member), icon_url=member.display_avatar.url)
+            embed.set_thumbnail(url=member.display_avatar.url)
+            await leave.send(embed=embed)
+
+        log_channel = await self.log_channel(member.guild.id, LogEvent.MEMBERS)
         if log_channel:
             webhook = await self.prepare_webhook(log_channel)
 
-            leave, text = await self.member_channel("leave", member.guild, member)
-            if leave:
-                embed: discord.Embed = self.bot.embed(description=text, color=0x3498DB)
-                embed.set_author(name=str(member), icon_url=member.avatar.url)
-                embed.set_thumbnail(url=member.avatar.url)
-                await leave.send(embed=embed)
-
             embed: discord.Embed = self.bot.embed(
                 description=f"{member} has left {member.guild}", color=0xE74C3C
             )
             embed.set_author(name=str(member), icon_url=member.avatar.url)
 
+            self.attribute(
+                member.guild.id, (discord.AuditLogAction.kick,), member.id, embed
+            )
+
             if self.embeds.get(member.guild.id, None):
                 embeds: List[discord.Embed] = self.embeds[member.guild.id][
                     "embeds"
@@ -690,42 +934,35 @@ class Events(commands.Cog):
         """
         An event called when member data has been updated.
         """
-        channel = await self.log_channel(before.guild.id)
-        if channel:
-            webhook = await self.prepare_webhook(channel)
-
-            changes = ""
-
-            if before.nick != after.nick:
-                changes += f"Nickname: {before.display_name} -> {after.display_name}\n"
+        if not self.subscribed(before.guild.id, LogEvent.MEMBERS):
+            return
 
-            elif before.pending != after.pending:
-                changes += f"Pending Verification: {before.pending} -> {after.pending}"
+        changes = ""
 
-            elif len(before.roles) != len(after.roles):
-                added = []
-                removed = []
-                total = "Roles:\n\n"
+        if before.nick != after.nick:
+            changes += f"Nickname: {before.display_name} -> {after.display_name}\n"
 
-                for old in before.roles:
-                    if not old in after.roles:
-                        removed.append(old.mention or old.name)
+        elif before.pending != after.pending:
+            changes += f"Pending Verification: {before.pending} -> {after.pending}"
 
-                for new in after.roles:
-                    if not new in before.roles:
-                        added.append(new.mention or new.name)
-
-                if len(added) >= 1:
-                    total += f"Role(s) Added: {', '.join(added)}\n"
+        elif before._roles != after._roles:
+            added, removed = diff_ids(before._roles, after._roles)
+            if added or removed:
+                changes += "Roles:\n\n"
+                if added:
+                    changes += (
+                        f"Role(s) Added: {', '.join(f'<@&{role}>' for role in added)}\n"
+                    )
 
-                if len(removed) >= 1:
-                    total += f"Role(s) Removed: {', '.join(removed)}\n"
+                if removed:
+                    changes += f"Role(s) Removed: {', '.join(f'<@&{role}>' for role in removed)}\n"
 
-                if len(added) >= 1 or len(removed) >= 1:
-                    changes += total
+        if changes == "":
+            return
 
-            if changes == "":
-                return
+        channel = await self.log_channel(before.guild.id, LogEvent.MEMBERS)
+        if channel:
+            webhook = await self.prepare_webhook(channel)
 
             embed: discord.Embed = self.bot.embed(
                 description=f"{before.mention}'s profile updated:\n\n{changes}",
@@ -733,6 +970,16 @@ class Events(commands.Cog):
             )
             embed.set_author(name=f"{before}", icon_url=before.avatar.url)
 
+            self.attribute(
+                before.guild.id,
+                (
+                    discord.AuditLogAction.member_update,
+                    discord.AuditLogAction.member_role_update,
+                ),
+                before.id,
+                embed,
+            )
+
             if self.embeds.get(before.guild.id, None):
                 embeds: List[discord.Embed] = self.embeds[before.guild.id][
                     "embeds"
@@ -750,71 +997,103 @@ class Events(commands.Cog):
     ) -> None:
         """
         An event called when a member's activity/presence has been updated.
+        Changes are buffered for `presence_window` seconds and logged as
+        one entry from the first to the last state.
         """
-        channel = await self.log_channel(before.guild.id)
-        if channel:
-            webhook = await self.prepare_webhook(channel)
+        if not self.subscribed(before.guild.id, LogEvent.PRESENCES):
+            return
 
-            changes = ""
+        key = (before.guild.id, before.id)
+        if key in self.presences:
+            return
 
-            if before.status != after.status:
-                changes += f"Status: {before.status} -> {after.status}\n".replace(
-                    "dnd", "do not disturb"
-                ).title()
+        self.presences[key] = (
+            before,
+            self.bot.loop.create_task(self.flush_presence(key, after)),
+        )
 
-            elif before.activity != after.activity:
-                before_type = ""
-                after_type = ""
+    @staticmethod
+    def presence_changes(before: discord.Member, after: discord.Member) -> str:
+        """
+        Returns a description of how a member's status or activity changed.
+        """
+        changes = ""
 
-                before_name = ""
-                after_name = ""
+        if before.status != after.status:
+            changes += f"Status: {before.status} -> {after.status}\n".replace(
+                "dnd", "do not disturb"
+            ).title()
 
-                if before.activity:
-                    before_type += (
-                        before.activity.type[0].title()
-                        or before.activity.type[0].title()
-                    )
+        elif before.activity != after.activity:
+            before_type = ""
+            after_type = ""
 
-                if after.activity:
-                    after_type += after.activity.type[0].title()
+            before_name = ""
+            after_name = ""
 
-                try:
-                    before_name += before.activity.name
-                except AttributeError:
-                    before_name += "N/A"
+            if before.activity:
+                before_type += (
+                    before.activity.type[0].title() or before.activity.type[0].title()
+                )
 
-                try:
-                    after_name += after.activity.name
-                except AttributeError:
-                    after_name += "N/A"
-
-                if before_name != after_name:
-                    if isinstance(before.activity, discord.BaseActivity) or isinstance(
-                        after.activity, discord.BaseActivity
-                    ):
-                        changes += f"Activity: {before_type if before_type != 'Custom' else ''} {before_name} -> {after_type if after_type != 'Custom' else ''} {after_name}\n"
-
-                    elif isinstance(before.activity, discord.Spotify) or isinstance(
-                        after.activity, discord.Spotify
-                    ):
-                        before_title = ""
-                        after_title = ""
-                        if before.activity:
-                            try:
-                                before_title += f"{before.activity.title} by {before.activity.artist} on Spotify"
-                            except AttributeError:
-                                pass
-
-                        if after.activity:
-                            try:
-                                after_title += f"{after.activity.title} by {after.activity.artist} on Spotify"
-                            except AttributeError:
-                                pass
-
-                        changes += f"Activity: {before_type + ' to' if before_type != '' else ''} {before_title if before_title != '' else 'N/A'} -> {after_type + ' to' if after_type != '' else ''} {after_title if after_title != '' else 'N/A'}\n"
-
-            if changes == "":
-                return
+            if after.activity:
+                after_type += after.activity.type[0].title()
+
+            try:
+                before_name += before.activity.name
+            except AttributeError:
+                before_name += "N/A"
+
+            try:
+                after_name += after.activity.name
+            except AttributeError:
+                after_name += "N/A"
+
+            if before_name != after_name:
+                if isinstance(before.activity, discord.BaseActivity) or isinstance(
+                    after.activity, discord.BaseActivity
+                ):
+                    changes += f"Activity: {before_type if before_type != 'Custom' else ''} {before_name} -> {after_type if after_type != 'Custom' else ''} {after_name}\n"
+
+                elif isinstance(before.activity, discord.Spotify) or isinstance(
+                    after.activity, discord.Spotify
+                ):
+                    before_title = ""
+                    after_title = ""
+                    if before.activity:
+                        try:
+                            before_title += f"{before.activity.title} by {before.activity.artist} on Spotify"
+                        except AttributeError:
+                            pass
+
+                    if after.activity:
+                        try:
+                            after_title += f"{after.activity.title} by {after.activity.artist} on Spotify"
+                        except AttributeError:
+                            pass
+
+                    changes += f"Activity: {before_type + ' to' if before_type != '' else ''} {before_title if before_title != '' else 'N/A'} -> {after_type + ' to' if after_type != '' else ''} {after_title if after_title != '' else 'N/A'}\n"
+
+        return changes
+
+    async def flush_presence(self, key: tuple[int, int], after: discord.Member) -> None:
+        """
+        |coro|
+
+        Waits out the coalescing window for a member, then logs the
+        net change of their presence, if any.
+        """
+        await asyncio.sleep(self.presence_window)
+        before, _ = self.presences.pop(key)
+        after = after.guild.get_member(after.id) or after
+
+        changes = self.presence_changes(before, after)
+        if changes == "":
+            return
+
+        channel = await self.log_channel(before.guild.id, LogEvent.PRESENCES)
+        if channel:
+            webhook = await self.prepare_webhook(channel)
 
             embed: discord.Embed = self.bot.embed(
                 description=f"{before.mention}'s presence updated:\n\n{changes}",
@@ -838,55 +1117,63 @@ class Events(commands.Cog):
         """
         An event called when user data has been updated.
         """
-        if not before.bot:
-            guilds: List[discord.Guild] = self.bot.guilds
-            for guild in guilds:
-                channel = await self.log_channel(guild.id)
-                if channel:
-                    webhook = await self.prepare_webhook(channel)
-                    for member in guild.members:
-                        if member.id == before.id:
-
-                            changes = ""
-                            avatar = ""
-
-                            if before.avatar != after.avatar:
-                                changes += f"Avatar: [Old]({before.avatar.url}) -> [New]({after.avatar.url})"
-                                avatar += str(after.avatar.url)
-
-                            elif (
-                                before.name != after.name
-                                or before.discriminator != after.discriminator
-                            ):
-                                changes += f"Username: {before} -> {after}"
-
-                            if not changes:
-                                return
-
-                            embed: discord.Embed = self.bot.embed(
-                                description=f"{guild.get_member(before.id).mention} updated their account.\n\n{changes}",
-                                color=0xE67E22,
-                            )
-                            embed.set_thumbnail(url=avatar)
+        if before.bot:
+            return
+
+        changes = ""
+        avatar = ""
+
+        if before.avatar != after.avatar:
+            changes += f"Avatar: [Old]({before.display_avatar.url}) -> [New]({after.display_avatar.url})"
+            avatar += str(after.display_avatar.url)
+
+        elif before.name != after.name or before.discriminator != after.discriminator:
+            changes += f"Username: {before} -> {after}"
+
+        if not changes:
+            return
+
+        await asyncio.gather(
+            *(
+                self.log_user_update(guild, after, changes, avatar)
+                for guild in self.member_guilds.get(before.id, ())
+                if self.subscribed(guild, LogEvent.USERS)
+            )
+        )
+
+    async def log_user_update(
+        self, guild: int, user: discord.User, changes: str, avatar: str
+    ) -> None:
+        """
+        |coro|
+
+        Queues a user update for the log channel of `guild`.
+        """
+        channel = await self.log_channel(guild, LogEvent.USERS)
+        if channel:
+            webhook = await self.prepare_webhook(channel)
+
+            embed: discord.Embed = self.bot.embed(
+                description=f"{user.mention} updated their account.\n\n{changes}",
+                color=0xE67E22,
+            )
+            if avatar:
+                embed.set_thumbnail(url=avatar)
 
-                            if self.embeds.get(guild.id, None):
-                                embeds: List[discord.Embed] = self.embeds[guild.id][
-                                    "embeds"
-                                ].append(embed)
+            if self.embeds.get(guild, None):
+                embeds: List[discord.Embed] = self.embeds[guild]["embeds"].append(embed)
 
-                                self.embeds[guild.id].update(embed=embeds)
-                                return
+                self.embeds[guild].update(embed=embeds)
+                return
 
-                            self.embeds[guild.id] = {
-                                "webhook": webhook,
-                                "embeds": [embed],
-                            }
+            self.embeds[guild] = {"webhook": webhook, "embeds": [embed]}
 
     @commands.Cog.listener()
     async def on_guild_join(self, guild: discord.Guild) -> None:
         """
         An event called when the bot joins a server.
         """
+        self.index_members(guild)
         if not hasattr(self, "owners"):
             self.owners: discord.User = [
                 await self.bot.fetch_user(owner) for owner in self.bot.owner_ids
@@ -903,6 +1190,10 @@ class Events(commands.Cog):
         """
         An event called when the bot leaves a server.
         """
+        self.unindex_guild(guild)
+        self.joins.discard(guild.id)
+        self.member_messages.pop((guild.id, "join"), None)
+        self.member_messages.pop((guild.id, "leave"), None)
         if not hasattr(self, "owners"):
             self.owners: discord.User = [
                 await self.bot.fetch_user(owner) for owner in self.bot.owner_ids
@@ -921,7 +1212,7 @@ class Events(commands.Cog):
         """
         An event called when a server has been updated.
         """
-        channel = await self.log_channel(before.id)
+        channel = await self.log_channel(before.id, LogEvent.SERVER)
         if channel:
             webhook = await self.prepare_webhook(channel)
 
@@ -952,6 +1243,10 @@ class Events(commands.Cog):
             embed.set_thumbnail(url=before.banner.url)
 
             if changes:
+                self.attribute(
+                    before.id, (discord.AuditLogAction.guild_update,), before.id, embed
+                )
+
                 if self.embeds.get(before.id, None):
                     embeds: List[discord.Embed] = self.embeds[before.id][
                         "embeds"
@@ -967,7 +1262,7 @@ class Events(commands.Cog):
         """
         An event called when a role has been created.
         """
-        channel = await self.log_channel(role.guild.id)
+        channel = await self.log_channel(role.guild.id, LogEvent.ROLES)
         if channel:
             webhook = await self.prepare_webhook(channel)
 
@@ -976,6 +1271,10 @@ class Events(commands.Cog):
             )
             embed.set_author(name=str(role.guild), icon_url=role.guild.icon.url)
 
+            self.attribute(
+                role.guild.id, (discord.AuditLogAction.role_create,), role.id, embed
+            )
+
             if self.embeds.get(role.guild.id, None):
                 embeds: List[discord.Embed] = self.embeds[role.guild.id][
                     "embeds"
@@ -991,7 +1290,7 @@ class Events(commands.Cog):
         """
         An event called when a role has been deleted.
         """
-        channel = await self.log_channel(role.guild.id)
+        channel = await self.log_channel(role.guild.id, LogEvent.ROLES)
         if channel:
             webhook = await self.prepare_webhook(channel)
 
@@ -1000,6 +1299,10 @@ class Events(commands.Cog):
             )
             embed.set_author(name=str(role.guild), icon_url=role.guild.icon.url)
 
+            self.attribute(
+                role.guild.id, (discord.AuditLogAction.role_delete,), role.id, embed
+            )
+
             if self.embeds.get(role.guild.id, None):
                 embeds: List[discord.Embed] = self.embeds[role.guild.id][
                     "embeds"
@@ -1017,76 +1320,56 @@ class Events(commands.Cog):
         """
         An event called when a role has been updated.
         """
-        channel = await self.log_channel(before.guild.id)
-        if channel:
-            webhook = await self.prepare_webhook(channel)
+        if not self.subscribed(before.guild.id, LogEvent.ROLES):
+            return
 
-            changes = None
+        changes = None
 
-            if before.name != after.name:
-                changes = f"Name: {before.name} -> {after.name}"
+        if before.name != after.name:
+            changes = f"Name: {before.name} -> {after.name}"
 
-            elif before.colour != after.colour:
-                changes = f"Color: {before.colour} -> {after.colour}"
-
-            elif before.permissions.value != after.permissions.value:
-
-                added = []
-                removed = []
-                total = "Permissions:\n\n"
-
-                for key, _ in dict(
-                    discord.Permissions(before.permissions.value)
-                ).items():
-                    if not key in [
-                        k
-                        for k, v in dict(
-                            discord.Permissions(after.permissions.value)
-                        ).items()
-                        if not v
-                    ]:
-                        removed.append(
-                            key.replace("_", " ").replace("guild", "server").title()
-                        )
+        elif before.colour != after.colour:
+            changes = f"Color: {before.colour} -> {after.colour}"
 
-                for k, _ in dict(discord.Permissions(after.permissions.value)).items():
-                    if not k in [
-                        key
-                        for key, value in dict(
-                            discord.Permissions(before.permissions.value)
-                        ).items()
-                        if value
-                    ]:
-                        added.append(
-                            k.replace("_", " ").replace("guild", "server").title()
-                        )
+        elif before.permissions.value != after.permissions.value:
+            granted, revoked = diff_permissions(
+                before.permissions.value, after.permissions.value
+            )
+            changes = "Permissions:\n\n"
+            if granted:
+                changes += f"✅ Allowed Permission(s):\n{', '.join(permission_names(granted))}\n\n"
 
-                if len(added) >= 1:
-                    total += f"✅ Allowed Permission(s):\n{', '.join(added)}\n\n"
+            if revoked:
+                changes += f"❌ Denied Permission(s):\n{', '.join(permission_names(revoked))}\n\n"
 
-                if len(removed) >= 1:
-                    total += f"❌ Denied Permission(s):\n{', '.join(removed)}\n\n"
+        if not changes:
+            return
 
-                if len(added) >= 1 or len(removed) >= 1:
-                    changes = total
+        channel = await self.log_channel(before.guild.id, LogEvent.ROLES)
+        if channel:
+            webhook = await self.prepare_webhook(channel)
 
             embed: discord.Embed = self.bot.embed(
                 description=f"Changes were made to the role `{before.name}`\n\n{changes}",
                 color=0xE67E22,
             )
             embed.set_author(name=f"{before.guild}", icon_url=before.guild.icon.url)
-            embed.set_thumbnail(url=before.guild.banner.url)
+            if before.guild.banner:
+                embed.set_thumbnail(url=before.guild.banner.url)
 
-            if changes:
-                if self.embeds.get(before.id, None):
-                    embeds: List[discord.Embed] = self.embeds[before.id][
-                        "embeds"
-                    ].append(embed)
+            self.attribute(
+                before.guild.id, (discord.AuditLogAction.role_update,), before.id, embed
+            )
 
-                    self.embeds[before.id].update(embed=embeds)
-                    return
+            if self.embeds.get(before.guild.id, None):
+                embeds: List[discord.Embed] = self.embeds[before.guild.id][
+                    "embeds"
+                ].append(embed)
 
-                self.embeds[before.id] = {"webhook": webhook, "embeds": [embed]}
+                self.embeds[before.guild.id].update(embed=embeds)
+                return
+
+            self.embeds[before.guild.id] = {"webhook": webhook, "embeds": [embed]}
 
     @commands.Cog.listener()
     async def on_guild_emojis_update(
@@ -1096,7 +1379,7 @@ class Events(commands.Cog):
         An event called whenever a guild emoji has been updated.
         """
         if len(before) != len(after):
-            channel = await self.log_channel(guild.id)
+            channel = await self.log_channel(guild.id, LogEvent.EMOJIS)
             if channel:
                 webhook = await self.prepare_webhook(channel)
 
@@ -1127,7 +1410,7 @@ class Events(commands.Cog):
         An event called whenever a guild sticker has been updated.
         """
         if len(before) != len(after):
-            channel = await self.log_channel(guild.id)
+            channel = await self.log_channel(guild.id, LogEvent.EMOJIS)
             if channel:
                 webhook = await self.prepare_webhook(channel)
 
@@ -1157,7 +1440,7 @@ class Events(commands.Cog):
         """
         An event called whenever a member joins/leaves a voice channel.
         """
-        channel = await self.log_channel(member.guild.id)
+        channel = await self.log_channel(member.guild.id, LogEvent.VOICE)
         if channel:
             webhook = await self.prepare_webhook(channel)
 
@@ -1194,7 +1477,7 @@ class Events(commands.Cog):
         """
         An event called whenever a stage channel is created.
         """
-        channel = await self.log_channel(stage.guild.id)
+        channel = await self.log_channel(stage.guild.id, LogEvent.STAGES)
         if channel:
             webhook = await self.prepare_webhook(channel)
 
@@ -1218,7 +1501,7 @@ class Events(commands.Cog):
         """
         An event called whenever a stage channel is deleted.
         """
-        channel = await self.log_channel(stage.guild.id)
+        channel = await self.log_channel(stage.guild.id, LogEvent.STAGES)
         if channel:
             webhook = await self.prepare_webhook(channel)
 
@@ -1244,7 +1527,7 @@ class Events(commands.Cog):
         """
         An event called whenever a stage channel is updated.
         """
-        channel = await self.log_channel(before.guild.id)
+        channel = await self.log_channel(before.guild.id, LogEvent.STAGES)
         if channel:
             webhook = await self.prepare_webhook(channel)
 
@@ -1301,7 +1584,7 @@ class Events(commands.Cog):
         """
         An event called whenever a member has been banned from a guild.
         """
-        channel = await self.log_channel(guild.id)
+        channel = await self.log_channel(guild.id, LogEvent.BANS)
         if channel:
             webhook = await self.prepare_webhook(channel)
 
@@ -1309,6 +1592,8 @@ class Events(commands.Cog):
                 description=f"{user} has been banned.", color=0xE74C3C
             )
 
+            self.attribute(guild.id, (discord.AuditLogAction.ban,), user.id, embed)
+
             if self.embeds.get(guild.id, None):
                 embeds: List[discord.Embed] = self.embeds[guild.id]["embeds"].append(
                     embed
@@ -1324,7 +1609,7 @@ class Events(commands.Cog):
         """
         An event called whenever a user has been unbanned from a guild.
         """
-        channel = await self.log_channel(guild.id)
+        channel = await self.log_channel(guild.id, LogEvent.BANS)
         if channel:
             webhook = await self.prepare_webhook(channel)
 
@@ -1332,6 +1617,8 @@ class Events(commands.Cog):
                 description=f"{user} has been unbanned.", color=0x2ECC71
             )
 
+            self.attribute(guild.id, (discord.AuditLogAction.unban,), user.id, embed)
+
             if self.embeds.get(guild.id, None):
                 embeds: List[discord.Embed] = self.embeds[guild.id]["embeds"].append(
                     embed
@@ -1347,7 +1634,7 @@ class Events(commands.Cog):
         """
         An event called whenever a channel invite has been created.
         """
-        channel = await self.log_channel(invite.guild.id)
+        channel = await self.log_channel(invite.guild.id, LogEvent.INVITES)
         if channel:
             webhook = await self.prepare_webhook(channel)
 
@@ -1393,7 +1680,7 @@ class Events(commands.Cog):
         """
         An event called whenever a channel invite has been deleted.
         """
-        channel = await self.log_channel(invite.guild.id)
+        channel = await self.log_channel(invite.guild.id, LogEvent.INVITES)
         if channel:
             webhook = await self.prepare_webhook(channel)
 
@@ -1,12 +1,16 @@
+import collections
 import datetime
+import re
 from datetime import timedelta
-from typing import Optional
+from typing import Awaitable, Callable, Optional, Union
 
 import discord
 from discord.ext import commands, tasks
 from main import Bot
 from utils import (
     BannedUserConverter,
+    BulkExecutor,
+    LogEvent,
     MemberConverter,
     SlowmodeConverter,
     TimeConverter,
@@ -23,8 +27,18 @@ class Moderation(commands.Cog):
     and server owners to assist with maintenance.
     """
 
+    raid_window = timedelta(seconds=60)
+    raid_threshold = 10
+    raid_history = timedelta(minutes=30)
+    young_account = timedelta(days=7)
+    bulk_delete_age = timedelta(days=14, minutes=-5)
+    clear_scan_limit = 10000
+
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
+        self.joins: dict[int, collections.deque[tuple[datetime.datetime, int]]] = {}
+        self.join_rate: dict[int, collections.deque[datetime.datetime]] = {}
+        self.raids: dict[int, datetime.datetime] = {}
         self.bot.loop.create_task(self.__ainit__())
 
     async def __ainit__(self) -> None:
@@ -110,6 +124,234 @@ class Moderation(commands.Cog):
     async def before_check_mutes(self) -> None:
         await self.bot.wait_until_ready()
 
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member) -> None:
+        """
+        Tracks joins per guild and raises a raid alert once more than
+        `raid_threshold` members join within `raid_window`.
+        """
+        now = discord.utils.utcnow()
+        joins = self.joins.setdefault(member.guild.id, collections.deque())
+        joins.append((now, member.id))
+        while now - joins[0][0] > self.raid_history:
+            joins.popleft()
+
+        rate = self.join_rate.setdefault(member.guild.id, collections.deque())
+        rate.append(now)
+        while now - rate[0] > self.raid_window:
+            rate.popleft()
+
+        if len(rate) < self.raid_threshold:
+            return
+
+        started = self.raids.get(member.guild.id)
+        if started and now - started < self.raid_history:
+            return
+
+        self.raids[member.guild.id] = now
+        events = self.bot.get_cog("Events")
+        channel = (
+            await events.log_channel(member.guild.id, LogEvent.MEMBERS)
+            if events
+            else None
+        )
+        if channel:
+            embed: discord.Embed = self.bot.embed(
+                description=f"⚠️ {len(rate)} members joined in the last {int(self.raid_window.total_seconds())} seconds. Use `/raid status` to review them and `/raid action` to ban, kick or mute them.",
+                color=0xE74C3C,
+                timestamp=now,
+            )
+            try:
+                await channel.send(embed=embed)
+            except discord.HTTPException:
+                pass
+
+    @staticmethod
+    def skeleton(name: str) -> str:
+        """
+        Reduces a name to lowercase letters so that names
+        like `raider123` and `Raider_456` compare equal.
+        """
+        return re.sub(r"[^a-z]", "", name.lower())
+
+    def suspicion(
+        self, member: discord.Member, names: collections.Counter
+    ) -> list[str]:
+        """
+        Returns the reasons `member` looks like part of a raid. `names`
+        counts the name skeletons of the other recent joins.
+        """
+        reasons = []
+        if discord.utils.utcnow() - member.created_at < self.young_account:
+            reasons.append("new account")
+
+        if member.avatar is None:
+            reasons.append("default avatar")
+
+        skeleton = self.skeleton(member.name)
+        if skeleton and names[skeleton] >= 3:
+            reasons.append("similar names")
+
+        return reasons
+
+    def raiders(
+        self, guild: discord.Guild, minutes: int, flagged_only: bool
+    ) -> list[tuple[discord.Member, list[str]]]:
+        """
+        Returns the members who joined `guild` in the last `minutes`
+        minutes with their suspicion reasons, skipping bots and members
+        that can manage messages.
+        """
+        since = discord.utils.utcnow() - timedelta(minutes=minutes)
+        members = [
+            member
+            for joined, member_id in self.joins.get(guild.id, ())
+            if joined >= since
+            and (member := guild.get_member(member_id))
+            and not member.bot
+            and not member.guild_permissions.manage_messages
+        ]
+        names = collections.Counter(self.skeleton(member.name) for member in members)
+        flagged = [(member, self.suspicion(member, names)) for member in members]
+        return [
+            (member, reasons)
+            for member, reasons in flagged
+            if reasons or not flagged_only
+        ]
+
+    @commands.Cog.listener()
+    async def on_member_ban(
+        self, guild: discord.Guild, user: Union[discord.User, discord.Member]
+    ) -> None:
+        self.bot.bans.add(guild.id, user)
+
+    @commands.Cog.listener()
+    async def on_member_unban(self, guild: discord.Guild, user: discord.User) -> None:
+        self.bot.bans.remove(guild.id, user.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        self.bot.bans.discard(guild.id)
+
+    @commands.group()
+    async def raid(self, context: commands.Context) -> None:
+        pass
+
+    @raid.command(name="status")
+    @is_mod()
+    async def raid_status(
+        self,
+        context: commands.Context,
+        minutes: int = commands.Option(
+            10, description="How far back to look for new members, in minutes."
+        ),
+    ) -> None:
+        """
+        Shows recent joins and which of them look like raiders.
+        """
+        minutes = max(1, min(minutes, int(self.raid_history.total_seconds() // 60)))
+        members = self.raiders(context.guild, minutes, False)
+        flagged = [(member, reasons) for member, reasons in members if reasons]
+        now = discord.utils.utcnow()
+        rate = sum(
+            now - joined <= self.raid_window
+            for joined in self.join_rate.get(context.guild.id, ())
+        )
+        lines = "\n".join(
+            f"{member.mention} ({', '.join(reasons)})"
+            for member, reasons in flagged[:20]
+        )
+        if len(flagged) > 20:
+            lines += f"\n...and {len(flagged) - 20} more"
+
+        embed: discord.Embed = context.bot.embed(
+            description=f"{len(members)} member(s) joined in the last {minutes} minute(s), {len(flagged)} flagged.\n{rate} joined in the last {int(self.raid_window.total_seconds())} seconds.\n\n{lines}",
+            color=0xE67E22,
+        )
+        await context.send(embed=embed, ephemeral=True)
+
+    @raid.command(name="action")
+    @is_admin()
+    async def raid_action(
+        self,
+        context: commands.Context,
+        action: str = commands.Option(description="One of ban, kick or mute."),
+        minutes: int = commands.Option(
+            10, description="How far back to look for new members, in minutes."
+        ),
+        flagged_only: bool = commands.Option(
+            True, description="Whether to only act on flagged members."
+        ),
+        reason: str = commands.Option(None, description="Reason for the action."),
+    ) -> None:
+        """
+        Bans, kicks or mutes every recent (flagged) member at once.
+        """
+        action = action.lower()
+        if action not in ("ban", "kick", "mute"):
+            raise commands.BadArgument("Action must be one of ban, kick or mute.")
+
+        minutes = max(1, min(minutes, int(self.raid_history.total_seconds() // 60)))
+        members = [
+            member for member, _ in self.raiders(context.guild, minutes, flagged_only)
+        ]
+        if not members:
+            await context.send("No members match.", ephemeral=True)
+            return
+
+        reason = reason or "Raid"
+        role = None
+        if action == "mute":
+            role = context.guild.get_role(self.bot.mute_role.get(context.guild.id))
+            if not role:
+                await context.send(
+                    f"Seems a muted role has not been setup. Please run `/settings muted @role` to setup.",
+                    ephemeral=True,
+                )
+                return
+
+            guild_mutes = self.muted.get(context.guild.id) or {}
+            members = [member for member in members if member.id not in guild_mutes]
+            if not members:
+                await context.send(
+                    "Every matching member is already muted.", ephemeral=True
+                )
+                return
+
+        async def act(member: discord.Member) -> None:
+            if action == "ban":
+                await context.guild.ban(member, delete_message_days=1, reason=reason)
+            elif action == "kick":
+                await context.guild.kick(member, reason=reason)
+            else:
+                await member.add_roles(role, reason=reason)
+
+        verb = {"ban": "Banning", "kick": "Kicking", "mute": "Muting"}[action]
+        executor = BulkExecutor(
+            progress=await self.bulk_progress(
+                context, f"{verb} {len(members)} member(s)"
+            )
+        )
+        done, failed = await executor.run(members, act)
+
+        if action == "mute" and done:
+            now = discord.utils.utcnow()
+            await context.bot.pool.executemany(
+                "INSERT INTO mutes VALUES ($1, $2, $3, $4, $5)",
+                [(context.guild.id, member.id, None, now, reason) for member in done],
+            )
+            self.muted.setdefault(context.guild.id, {}).update(
+                {member.id: None for member in done}
+            )
+
+        past = {"ban": "banned", "kick": "kicked", "mute": "muted"}[action]
+        embed: discord.Embed = context.bot.embed(
+            description=f"{len(done)} member(s) {past}.{f' {len(failed)} could not be {past}.' if failed else ''} Reason: {reason}",
+            color=0xE74C3C,
+            timestamp=discord.utils.utcnow(),
+        )
+        await context.send(embed=embed)
+
     @commands.group()
     async def ban(self, context: commands.Context) -> None:
         pass
@@ -262,29 +504,21 @@ class Moderation(commands.Cog):
         self,
         context: commands.Context,
         username: str = commands.Option(
-            description="Username and discriminator of user to unban."
+            description="Id or username#discriminator of the user to unban."
         ),
         reason: str = commands.Option(None, description="Reason for unban."),
     ) -> None:
         """
-        Allows admins/owners to unban a user from a server by username#discriminator.
+        Allows admins/owners to unban a user from a server by id or username#discriminator.
         """
-        user = (
-            await MemberConverter().convert(context, username)
-            or await UserConverter().convert(context, username)
-            or await BannedUserConverter().convert(context, username)
+        user = await BannedUserConverter().convert(context, username)
+        await context.guild.unban(user, reason=reason)
+        embed: discord.Embed = context.bot.embed(
+            description=f"{user} ({user.id}) has been unbanned. Reason: {reason or 'no reason provided.'}",
+            color=0xE67E22,
+            timestamp=discord.utils.utcnow(),
         )
-        if user:
-            await context.guild.unban(user, reason=reason)
-            embed: discord.Embed = context.bot.embed(
-                description=f"{username} has been unbanned. Reason: {reason or 'no reason provided.'}",
-                color=0xE67E22,
-                timestamp=discord.utils.utcnow(),
-            )
-            await context.send(embed=embed)
-            return
-
-        raise commands.UserNotFound(username)
+        await context.send(embed=embed)
 
     @commands.command()
     @is_mod()
@@ -306,6 +540,7 @@ class Moderation(commands.Cog):
         await context.send(embed=embed)
 
     @commands.command()
+    @is_mod()
     async def clear(
         self,
         context: commands.Context,
@@ -315,20 +550,212 @@ class Moderation(commands.Cog):
         amount: int = commands.Option(
             description="Amount of messages to clear. Amount can only be between 1-1000."
         ),
+        user: discord.User = commands.Option(
+            None, description="Only clear messages sent by this user."
+        ),
+        contains: str = commands.Option(
+            None, description="Only clear messages containing this text."
+        ),
+        attachments: bool = commands.Option(
+            None, description="Only clear messages with attachments."
+        ),
+        bots: bool = commands.Option(
+            None, description="Only clear messages from bots."
+        ),
+        before: str = commands.Option(
+            None, description="Only clear messages sent before this message id."
+        ),
+        after: str = commands.Option(
+            None, description="Only clear messages sent after this message id."
+        ),
     ) -> None:
         """
         Allows mods/admins/owners to remove up to 1000
-        channel messages.
+        channel messages, optionally filtered.
         """
         _channel = channel or context.channel
-        _amount = amount + 1 if amount == 0 else 1000 if amount > 1000 else amount
+        _amount = max(1, min(amount, 1000))
 
-        deleted: int = 0
-        messages = await _channel.purge(limit=_amount)
-        deleted += len(messages)
+        text = contains.casefold() if contains else None
+
+        try:
+            before_id = discord.Object(int(before)) if before else None
+            after_id = discord.Object(int(after)) if after else None
+        except ValueError:
+            raise commands.BadArgument("Message ids must be numbers.")
+
+        def matches(message: discord.Message) -> bool:
+            if user and message.author.id != user.id:
+                return False
+
+            if bots and not message.author.bot:
+                return False
+
+            if attachments and not message.attachments:
+                return False
+
+            if text and text not in message.content.casefold():
+                return False
+
+            return True
+
+        bulk_cutoff = discord.utils.utcnow() - self.bulk_delete_age
+        deleted = 0
+        scanned = 0
+        batch: list[discord.Message] = []
+        old: list[discord.Message] = []
+
+        async def flush() -> None:
+            nonlocal deleted
+            if len(batch) == 1:
+                await batch[0].delete()
+            elif batch:
+                await _channel.delete_messages(batch)
+
+            deleted += len(batch)
+            batch.clear()
+
+        async for message in _channel.history(
+            limit=None, before=before_id, after=after_id, oldest_first=False
+        ):
+            scanned += 1
+            if scanned > self.clear_scan_limit:
+                break
+
+            if not matches(message):
+                continue
+
+            if message.created_at > bulk_cutoff:
+                batch.append(message)
+                if len(batch) == 100:
+                    await flush()
+            else:
+                old.append(message)
+
+            if len(batch) + len(old) + deleted >= _amount:
+                break
+
+        await flush()
+
+        if old:
+            executor = BulkExecutor(
+                concurrency=4,
+                progress=await self.bulk_progress(
+                    context, f"Deleting {len(old)} message(s) older than 14 days"
+                ),
+            )
+            done, _ = await executor.run(old, lambda message: message.delete())
+            deleted += len(done)
 
         await context.send(f"Cleared {deleted} messages.", ephemeral=True)
 
+    async def bulk_progress(
+        self, context: commands.Context, action: str
+    ) -> Callable[[int, int, int], Awaitable[None]]:
+        """
+        |coro|
+
+        Sends an ephemeral progress message and returns a
+        callback that edits it for :class:`BulkExecutor`.
+        """
+        message = await context.send(f"{action}...", ephemeral=True)
+
+        async def progress(done: int, failed: int, total: int) -> None:
+            if message:
+                await message.edit(
+                    content=f"{action}... {done + failed}/{total}{f' ({failed} failed)' if failed else ''}"
+                )
+
+        return progress
+
+    async def lock_channels(
+        self, context: commands.Context, channels: list[discord.TextChannel]
+    ) -> tuple[list, list]:
+        """
+        |coro|
+
+        Saves each channel's current `@everyone` overwrite, unless one
+        is already saved from an unfinished lock, then denies sending
+        messages in every channel that is not already locked.
+        """
+        everyone = context.guild.default_role
+        snapshot = []
+        for channel in channels:
+            allow, deny = channel.overwrites_for(everyone).pair()
+            snapshot.append((context.guild.id, channel.id, allow.value, deny.value))
+
+        await context.bot.pool.executemany(
+            "INSERT INTO lockdowns (guild, channel, allow, deny, locked) VALUES ($1, $2, $3, $4, now()) ON CONFLICT (guild, channel) DO NOTHING",
+            snapshot,
+        )
+
+        async def lock(channel: discord.TextChannel) -> None:
+            overwrite = channel.overwrites_for(everyone)
+            if overwrite.send_messages is not False:
+                overwrite.send_messages = False
+                await channel.set_permissions(everyone, overwrite=overwrite)
+
+        executor = BulkExecutor(
+            errors=(discord.HTTPException, discord.InvalidArgument),
+            progress=(
+                await self.bulk_progress(context, "🔒 Locking channels")
+                if len(channels) > 1
+                else None
+            ),
+        )
+        return await executor.run(channels, lock)
+
+    async def unlock_channels(
+        self, context: commands.Context, channels: list[discord.TextChannel]
+    ) -> tuple[list, list]:
+        """
+        |coro|
+
+        Restores the `@everyone` overwrite each channel had before it was
+        locked. Channels without a saved overwrite have `send_messages`
+        reset instead. Saved overwrites are only removed once restored,
+        so an interrupted unlock can be run again.
+        """
+        everyone = context.guild.default_role
+        saved = {
+            channel: (allow, deny)
+            for channel, allow, deny in await context.bot.pool.fetch(
+                "SELECT channel, allow, deny FROM lockdowns WHERE guild = $1 AND channel = ANY($2::bigint[])",
+                context.guild.id,
+                [channel.id for channel in channels],
+            )
+        }
+
+        async def unlock(channel: discord.TextChannel) -> None:
+            if channel.id in saved:
+                allow, deny = saved[channel.id]
+                overwrite = discord.PermissionOverwrite.from_pair(
+                    discord.Permissions(allow), discord.Permissions(deny)
+                )
+            else:
+                overwrite = channel.overwrites_for(everyone)
+                overwrite.send_messages = None
+
+            await channel.set_permissions(
+                everyone, overwrite=None if overwrite.is_empty() else overwrite
+            )
+
+        executor = BulkExecutor(
+            errors=(discord.HTTPException, discord.InvalidArgument),
+            progress=(
+                await self.bulk_progress(context, "🔓 Unlocking channels")
+                if len(channels) > 1
+                else None
+            ),
+        )
+        done, failed = await executor.run(channels, unlock)
+        await context.bot.pool.execute(
+            "DELETE FROM lockdowns WHERE guild = $1 AND channel = ANY($2::bigint[])",
+            context.guild.id,
+            [channel.id for channel in done],
+        )
+        return done, failed
+
     @commands.command()
     @is_mod()
     async def lock(
@@ -346,27 +773,25 @@ class Moderation(commands.Cog):
         sent in a channel.
         """
         if all_channels:
-            for channel in context.guild.text_channels:
-                try:
-                    await channel.set_permissions(
-                        context.guild.default_role, send_messages=False
-                    )
-                except (
-                    discord.Forbidden,
-                    discord.HTTPException,
-                    discord.NotFound,
-                    discord.InvalidArgument,
-                ):
-                    continue
-
-            await context.send("🔒 All channels are now locked.", ephemeral=True)
+            done, failed = await self.lock_channels(
+                context, context.guild.text_channels
+            )
+            await context.send(
+                f"🔒 All channels are now locked.{f' {len(failed)} channel(s) could not be locked, run this again to retry.' if failed else ''}",
+                ephemeral=True,
+            )
 
         else:
             channel: discord.TextChannel = channel or context.channel
-            await channel.set_permissions(
-                context.guild.default_role, send_messages=False
+            done, failed = await self.lock_channels(context, [channel])
+            await context.send(
+                (
+                    "🔒 Channel is now locked."
+                    if done
+                    else "🔒 Channel could not be locked."
+                ),
+                ephemeral=True,
             )
-            await context.send("🔒 Channel is now locked.", ephemeral=True)
 
     @commands.command()
     @is_mod()
@@ -384,29 +809,26 @@ class Moderation(commands.Cog):
         Allows mods/admins/owners to allow messages to be sent
         in a channel.
         """
-
         if all_channels:
-            for channel in context.guild.text_channels:
-                try:
-                    await channel.set_permissions(
-                        context.guild.default_role, send_messages=None
-                    )
-                except (
-                    discord.Forbidden,
-                    discord.HTTPException,
-                    discord.NotFound,
-                    discord.InvalidArgument,
-                ):
-                    continue
-
-            await context.send("🔒 All channels are now unlocked.", ephemeral=True)
+            done, failed = await self.unlock_channels(
+                context, context.guild.text_channels
+            )
+            await context.send(
+                f"🔒 All channels are now unlocked.{f' {len(failed)} channel(s) could not be unlocked, run this again to retry.' if failed else ''}",
+                ephemeral=True,
+            )
 
         else:
             channel: discord.TextChannel = channel or context.channel
-            await channel.set_permissions(
-                context.guild.default_role, send_messages=None
+            done, failed = await self.unlock_channels(context, [channel])
+            await context.send(
+                (
+                    "🔒 Channel is now unlocked."
+                    if done
+                    else "🔒 Channel could not be unlocked."
+                ),
+                ephemeral=True,
             )
-            await context.send("🔒 Channel is now unlocked.", ephemeral=True)
 
     @commands.command()
     @is_mod()
@@ -1,57 +1,544 @@
+import asyncio
+import collections
 import datetime
+import itertools
+import json
+from typing import Callable, Optional
+
 import discord
 import wavelink
-from discord.ext import commands
+from discord.ext import commands, tasks
 from cogs.errors import dj_perms
 from main import Bot
-from utils import QueueList, TrackConverter, start_menu
+from utils import (
+    QueuePages,
+    TrackConverter,
+    TrackStream,
+    best_node,
+    deserialize_track,
+    node_penalty,
+    serialize_track,
+    start_menu,
+)
+
+
+class Queue(wavelink.Queue):
+    """
+    A :class:`wavelink.Queue` that counts its changes in `version`
+    so snapshots and rendered pages can be reused until it changes.
+
+    When `journal` is set, every change is also passed to it
+    as an operation so the queue can be persisted. Only the methods
+    that change the deque are journaled, since wavelink routes
+    `extend`, `put_at_front` and item assignment through them.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.version = 0
+        self.journal: Optional[Callable] = None
+
+    def changed(self, op: str, item=None, index: Optional[int] = None) -> None:
+        self.version += 1
+        if self.journal:
+            self.journal(op, item, index)
+
+    def get(self):
+        item = super().get()
+        self.changed("get")
+        return item
+
+    def pop(self):
+        item = super().pop()
+        self.changed("pop")
+        return item
+
+    def put(self, item) -> None:
+        super().put(item)
+        self.changed("put", item)
+
+    def put_at_index(self, index: int, item) -> None:
+        super().put_at_index(index, item)
+        self.changed("insert", item, index)
+
+    def clear(self) -> None:
+        super().clear()
+        self.changed("clear")
+
+    def __delitem__(self, index: int) -> None:
+        super().__delitem__(index)
+        self.changed("delete", index=index)
+
+
+class QueueJournal:
+    """
+    Persists player queues as an append-only log of queue operations
+    that is compacted into a single snapshot row per guild.
+    -----------------------------
+
+    Operations are only buffered in memory when they happen and are
+    written in batches by :method:`flush`, so queueing tracks never
+    waits on the database.
+    """
+
+    compact_after = 250
+
+    def __init__(self, pool) -> None:
+        self.pool = pool
+        self.pending: list[
+            tuple[int, str, Optional[int], Optional[wavelink.abc.Playable]]
+        ] = []
+        self.counts: dict[int, int] = {}
+
+    def record(
+        self, guild: int, op: str, item=None, index: Optional[int] = None
+    ) -> None:
+        self.pending.append((guild, op, index, item))
+        self.counts[guild] = self.counts.get(guild, 0) + 1
+
+    async def flush(self) -> None:
+        """
+        |coro|
+
+        Writes all buffered operations in a single batch.
+        """
+        if not self.pending:
+            return
+
+        pending, self.pending = self.pending, []
+        await self.pool.executemany(
+            "INSERT INTO music_queue_ops (guild, op, position, track) VALUES ($1, $2, $3, $4)",
+            [
+                (
+                    guild,
+                    op,
+                    index,
+                    json.dumps(serialize_track(item)) if item is not None else None,
+                )
+                for guild, op, index, item in pending
+            ],
+        )
+
+    def needs_compaction(self, guild: int) -> bool:
+        return self.counts.get(guild, 0) >= self.compact_after
+
+    async def compact(self, player: "Player") -> None:
+        """
+        |coro|
+
+        Replaces a guild's operations with a snapshot of the player.
+        """
+        guild = player._channel.guild.id
+        tracks = json.dumps([serialize_track(track) for track in player.queue])
+        current = json.dumps(serialize_track(player.source)) if player.source else None
+        position = int(player.position * 1000) if player.source else 0
+
+        # Buffered operations are already part of the snapshot.
+        self.pending = [entry for entry in self.pending if entry[0] != guild]
+        self.counts[guild] = 0
+
+        async with self.pool.acquire() as connection:
+            async with connection.transaction():
+                await connection.execute(
+                    "INSERT INTO music_queues (guild, channel, tracks, current, position, updated) VALUES ($1, $2, $3, $4, $5, $6) ON CONFLICT (guild) DO UPDATE SET channel = $2, tracks = $3, current = $4, position = $5, updated = $6",
+                    guild,
+                    player._channel.id,
+                    tracks,
+                    current,
+                    position,
+                    discord.utils.utcnow(),
+                )
+                await connection.execute(
+                    "DELETE FROM music_queue_ops WHERE guild = $1", guild
+                )
+
+    async def discard(self, guild: int) -> None:
+        """
+        |coro|
+
+        Forgets a guild's persisted queue.
+        """
+        self.pending = [entry for entry in self.pending if entry[0] != guild]
+        self.counts.pop(guild, None)
+        await self.pool.execute("DELETE FROM music_queues WHERE guild = $1", guild)
+        await self.pool.execute("DELETE FROM music_queue_ops WHERE guild = $1", guild)
+
+    async def restore(self, player: "Player") -> None:
+        """
+        |coro|
+
+        Rebuilds a player's queue and now playing track from
+        the last snapshot and the operations logged after it.
+        """
+        guild = player._channel.guild.id
+        await self.flush()
+
+        snapshot = await self.pool.fetchrow(
+            "SELECT tracks, current, position FROM music_queues WHERE guild = $1", guild
+        )
+        ops = await self.pool.fetch(
+            "SELECT op, position, track FROM music_queue_ops WHERE guild = $1 ORDER BY id",
+            guild,
+        )
+        if not snapshot and not ops:
+            return
+
+        tracks, current, position = [], None, 0
+        if snapshot:
+            tracks = json.loads(snapshot["tracks"])
+            current = json.loads(snapshot["current"]) if snapshot["current"] else None
+            position = snapshot["position"]
+
+        for op, index, track in ops:
+            track = json.loads(track) if track else None
+            if op == "put":
+                tracks.append(track)
+            elif op == "insert" and index is not None:
+                tracks.insert(index, track)
+            elif (
+                op == "delete"
+                and index is not None
+                and -len(tracks) <= index < len(tracks)
+            ):
+                del tracks[index]
+            elif op == "pop" and tracks:
+                tracks.pop()
+            elif op == "get" and tracks:
+                current, position = tracks.pop(0), 0
+            elif op == "clear":
+                tracks.clear()
+            elif op == "stop":
+                tracks.clear()
+                current, position = None, 0
+
+        journal, player.queue.journal = player.queue.journal, None
+        player.queue.extend(deserialize_track(track) for track in tracks)
+        if current:
+            track = deserialize_track(current)
+            player.queue.put_at_front(track)
+            player.resume_from = (track, position)
+        player.queue.journal = journal
+
+        await self.discard(guild)
+        if player.queue.count:
+            await self.compact(player)
 
 
 class Player(wavelink.Player):
-    def __init__(self, channel: discord.TextChannel, *args, **kwargs) -> None:
+    prefetch_count = 3
+    autoplay_count = 10
+    announce_interval = 5
+    default_bitrate = 64000
+
+    def __init__(
+        self,
+        channel: discord.TextChannel,
+        *args,
+        journal: Optional[QueueJournal] = None,
+        **kwargs,
+    ) -> None:
         super().__init__(*args, **kwargs)
         self.bot = channel.guild.me
         self._channel = channel
-        self.queue = wavelink.Queue()
+        self.queue = Queue()
+        self.snapshot: tuple = ()
+        self.snapshot_version = -1
+        self.pages: dict[tuple[int, int], discord.Embed] = {}
+        self.journal = journal
+        self.resume_from: Optional[tuple[wavelink.abc.Playable, int]] = None
+        self.prefetched: dict[
+            int, tuple[wavelink.PartialTrack, Optional[wavelink.Track]]
+        ] = {}
+        self.prefetch_task: Optional[asyncio.Task] = None
+        self.autoplay = False
+        self.history: collections.deque[str] = collections.deque(maxlen=50)
+        self.now_playing: Optional[discord.Message] = None
+        self.announcing: Optional[wavelink.Track] = None
+        self.announce_task: Optional[asyncio.Task] = None
+        self.announced_at = 0.0
+        self.created_at = discord.utils.utcnow()
+        self.idle_since: Optional[datetime.datetime] = None
+        self.tracks_played = 0
+        self.streamed = 0.0
+        self.playing_since: Optional[float] = None
+        if journal:
+            self.queue.journal = lambda op, item, index: journal.record(
+                channel.guild.id, op, item, index
+            )
 
     async def next(self, skip: bool = True):
+        while True:
+            if self.queue.is_empty and self.autoplay:
+                await self.enqueue_related()
+
+            try:
+                track = self.queue.get()
+            except wavelink.QueueEmpty:
+                await self.stop()
+                await self._channel.send(
+                    "No songs remaining in queue.", delete_after=15
+                )
+                return
+
+            start = 0
+            if self.resume_from and self.resume_from[0] is track:
+                start = self.resume_from[1]
+            self.resume_from = None
+
+            if isinstance(track, wavelink.PartialTrack):
+                partial, resolved = self.prefetched.pop(id(track), (track, track))
+                if resolved is None:
+                    continue
+
+                track = resolved
+
+            await self.play(track, replace=skip, start=start)
+            if isinstance(track, wavelink.Track):
+                self.history.append(track.identifier)
+            self.schedule_prefetch()
+            return
+
+    def announce(self, track: wavelink.Track) -> None:
+        """
+        Queues a now playing update for `track`. Updates are sent at most
+        once every `announce_interval` seconds and only the latest track
+        is shown, so rapid skips collapse into a single edit.
+        """
+        self.announcing = track
+        if self.announce_task is None or self.announce_task.done():
+            self.announce_task = asyncio.create_task(self.flush_announcement())
+
+    async def flush_announcement(self) -> None:
+        """
+        |coro|
+
+        Waits out the debounce window then edits the now playing
+        message in place, sending a new one only if there is none yet.
+        Tracks announced while a message is being sent are picked up
+        by the next pass instead of being dropped.
+        """
+        loop = asyncio.get_running_loop()
+        while self.announcing is not None:
+            delay = self.announced_at + self.announce_interval - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            track, self.announcing = self.announcing, None
+            if track is None:
+                return
+
+            embed = discord.Embed(
+                title=f"Now playing {track.title}", url=track.uri, color=0x2ECC71
+            )
+            embed.set_thumbnail(
+                url=f"https://i.ytimg.com/vi_webp/{track.identifier}/maxresdefault.webp"
+            )
+            embed.set_footer(
+                text=f"Track length: {datetime.timedelta(seconds=track.duration)} | {self.queue.count} tracks in queue."
+            )
+            self.announced_at = loop.time()
+            try:
+                if self.now_playing:
+                    try:
+                        await self.now_playing.edit(embed=embed)
+                        continue
+                    except discord.NotFound:
+                        self.now_playing = None
+
+                self.now_playing = await self._channel.send(embed=embed)
+            except discord.HTTPException:
+                pass
+
+    def started(self) -> None:
+        """
+        Marks the start of streaming for the current track.
+        """
+        self.tracks_played += 1
+        self.playing_since = asyncio.get_running_loop().time()
+
+    def account(self) -> None:
+        """
+        Adds the time streamed since the last call to `started`
+        or `resume` to the running total.
+        """
+        if self.playing_since is not None:
+            self.streamed += asyncio.get_running_loop().time() - self.playing_since
+            self.playing_since = None
+
+    @property
+    def bytes_streamed(self) -> int:
+        """
+        An estimate of the audio sent to Discord so far, based on the
+        voice channel's bitrate.
+        """
+        streamed = self.streamed
+        if self.playing_since is not None:
+            streamed += asyncio.get_running_loop().time() - self.playing_since
+
+        bitrate = getattr(self.channel, "bitrate", None) or self.default_bitrate
+        return int(streamed * bitrate / 8)
+
+    def is_idle(self) -> bool:
+        """
+        Whether nobody is listening or nothing is being played.
+        """
+        if self.channel is None:
+            return True
+
+        listeners = [member for member in self.channel.members if not member.bot]
+        return not listeners or self.is_paused() or not self.is_playing()
+
+    def refresh_idle(self) -> None:
+        """
+        Starts or clears the idle timer depending on `is_idle`.
+        """
+        if self.is_idle():
+            self.idle_since = self.idle_since or discord.utils.utcnow()
+        else:
+            self.idle_since = None
+
+    async def pause(self):
+        self.account()
+        await super().pause()
+        self.refresh_idle()
+
+    async def resume(self):
+        await super().resume()
+        self.playing_since = asyncio.get_running_loop().time()
+        self.refresh_idle()
+
+    def schedule_prefetch(self) -> None:
+        """
+        Starts resolving the next queued partial tracks in the
+        background unless that is already in progress.
+        """
+        if self.prefetch_task is None or self.prefetch_task.done():
+            self.prefetch_task = asyncio.create_task(self.prefetch())
+
+    async def prefetch(self) -> None:
+        """
+        |coro|
+
+        Resolves the next `prefetch_count` queued partial tracks so they
+        can start as soon as the current track ends. Tracks that fail to
+        resolve are remembered and skipped when they are reached.
+        """
+        upcoming = list(itertools.islice(self.queue, self.prefetch_count))
+        window = {id(track) for track in upcoming}
+        for key in list(self.prefetched):
+            if key not in window:
+                del self.prefetched[key]
+
+        for track in upcoming:
+            if not isinstance(track, wavelink.PartialTrack):
+                continue
+
+            if id(track) in self.prefetched:
+                continue
+
+            try:
+                resolved = await track._search()
+            except Exception:
+                resolved = None
+
+            self.prefetched[id(track)] = (track, resolved)
+
+    async def enqueue_related(self) -> None:
+        """
+        |coro|
+
+        Queues tracks from the YouTube mix of the last played track
+        when autoplay is enabled and the queue has run dry.
+        """
+        if not self.history:
+            return
+
+        seed = self.history[-1]
         try:
-            track = self.queue.get()
-            await self.play(track, replace=skip)
-        except wavelink.QueueEmpty:
-            await self.stop()
-            await self._channel.send("No songs remaining in queue.", delete_after=15)
+            mix = await self.node.get_playlist(
+                cls=wavelink.YouTubePlaylist,
+                identifier=f"https://www.youtube.com/watch?v={seed}&list=RD{seed}",
+            )
+        except Exception:
+            return
 
-    async def stop(self):
+        if not mix:
+            return
+
+        related = [
+            track for track in mix.tracks if track.identifier not in self.history
+        ]
+        self.queue.extend(related[: self.autoplay_count])
+
+    async def stop(self, *, keep_queue: bool = False):
+        self.account()
+        if self.queue.journal and not keep_queue:
+            self.queue.journal("stop", None, None)
+        if self.prefetch_task:
+            self.prefetch_task.cancel()
+        self.prefetched.clear()
+        if self.announce_task:
+            self.announce_task.cancel()
+        if self.now_playing:
+            try:
+                await self.now_playing.delete()
+            except discord.HTTPException:
+                pass
+            self.now_playing = None
         await self.disconnect(force=True)
         return await super().stop()
 
-    async def tracks(self):
-        yt_url = "https://www.youtube.com/results?search_query="
-        cutoff = 10
-        page = 1
-        embeds = []
-        queue = [track for track in self.queue]
-        for slice in range(0, self.queue.count, cutoff):
-            embed: discord.Embed = discord.Embed(
-                title=f"{len(queue)} songs in queue",
-                description="\n".join(
-                    [
-                        f"{index}. \
-                        [{track.query if isinstance(track, wavelink.PartialTrack) else track.info['title']}]({f'{yt_url}{track.query}'.replace(' ', '+') if isinstance(track, wavelink.PartialTrack) else track.info['uri']})\
-                        {'' if isinstance(track, wavelink.PartialTrack) else f'- {datetime.timedelta(seconds=track.duration)}'}"
-                        for index, track in enumerate(
-                            queue[slice : slice + cutoff], start=slice + 1
-                        )
-                    ]
-                ),
-                color=0x2ECC71,
+    async def migrate(self, node: wavelink.Node) -> None:
+        """
+        |coro|
+
+        Moves the player to another node by replaying the voice
+        session on it and resuming the current track where it left off.
+
+        wavelink has no public way to hand a voice session to another
+        node, so the session is replayed from the voice state kept by
+        the pinned 1.0.0b30 player. Any other version raises
+        :class:`commands.CommandError` before the player is touched.
+        """
+        dispatch = getattr(self, "_dispatch_voice_update", None)
+        voice_state = getattr(self, "_voice_state", None)
+        if dispatch is None or not isinstance(voice_state, dict):
+            raise commands.CommandError(
+                "This version of wavelink cannot move players between nodes."
             )
-            embed.set_footer(text=f"Page {page}/{(len(queue) // cutoff) + 1}")
-            embeds.append(embed)
-            page += 1
 
-        return embeds
+        previous = self.node
+        track, position, paused = self.source, self.position, self.is_paused()
+
+        # Events from the old node are ignored once it no longer lists the player.
+        if self in previous.players:
+            previous.players.remove(self)
+        if track and previous.is_connected():
+            try:
+                await wavelink.Player.stop(self)
+            except Exception:
+                pass
+
+        self.node = node
+        node.players.append(self)
+
+        await dispatch(voice_state)
+        if track:
+            await self.play(track, replace=True, start=int(position * 1000))
+            if paused:
+                await self.set_pause(True)
+
+    def tracks(self) -> QueuePages:
+        """
+        Returns a page source over a snapshot of the queue. The snapshot
+        and its rendered pages are reused until the queue changes.
+        """
+        if self.snapshot_version != self.queue.version:
+            self.snapshot = tuple(self.queue)
+            self.snapshot_version = self.queue.version
+            self.pages.clear()
+
+        return QueuePages(self.snapshot, self.snapshot_version, self.pages)
 
 
 class Music(commands.Cog):
@@ -59,11 +546,146 @@ class Music(commands.Cog):
     A module for playing music.
     """
 
+    degraded_penalty = 2500
+    idle_timeout = datetime.timedelta(minutes=5)
+
     def __init__(self, bot: Bot):
         self.bot = bot
         self.cooldown = commands.CooldownMapping.from_cooldown(
             1.0, 3.0, commands.BucketType.user
         )
+        self.journal = QueueJournal(self.bot.pool)
+        self.persist_queues.start()
+        self.balance_nodes.start()
+        self.reap_idle.start()
+
+    def cog_unload(self) -> None:
+        """
+        This method is called before the extension is unloaded
+        to allow for the running task loop to gracefully
+        close after writing any buffered queue operations.
+        """
+        self.persist_queues.stop()
+        self.balance_nodes.cancel()
+        self.reap_idle.cancel()
+        super().cog_unload()
+
+    @tasks.loop(seconds=30, reconnect=True)
+    async def reap_idle(self) -> None:
+        """
+        |coro|
+
+        A running task loop that disconnects players which have had no
+        listeners, been paused, or had nothing to play for longer than
+        `idle_timeout`. The saved queue is kept so it can be restored.
+        """
+        now = discord.utils.utcnow()
+        for node in self.bot.nodes:
+            for player in list(node.players):
+                if not isinstance(player, Player):
+                    continue
+
+                player.refresh_idle()
+                if player.idle_since and now - player.idle_since >= self.idle_timeout:
+                    channel = player.channel
+                    await player.stop(keep_queue=True)
+                    await player._channel.send(
+                        f"Left {channel.mention if channel else 'voice'} after {int(self.idle_timeout.total_seconds() // 60)} minutes of inactivity.",
+                        delete_after=15,
+                    )
+
+    @reap_idle.before_loop
+    async def before_reap_idle(self) -> None:
+        await self.bot.wait_until_ready()
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(
+        self,
+        member: discord.Member,
+        before: discord.VoiceState,
+        after: discord.VoiceState,
+    ):
+        player = member.guild.voice_client
+        if not isinstance(player, Player):
+            return
+
+        if player.channel in (before.channel, after.channel):
+            player.refresh_idle()
+
+    @tasks.loop(seconds=30, reconnect=True)
+    async def balance_nodes(self) -> None:
+        """
+        |coro|
+
+        A running task loop that moves players off nodes which have
+        disconnected or report a penalty above `degraded_penalty`.
+        """
+        degraded = [
+            node
+            for node in self.bot.nodes
+            if not node.is_connected() or node_penalty(node) > self.degraded_penalty
+        ]
+        for node in degraded:
+            for player in list(node.players):
+                try:
+                    target = best_node(
+                        self.bot.nodes, self.region(player.channel), exclude=degraded
+                    )
+                except commands.CommandError:
+                    continue
+
+                if node_penalty(target) > self.degraded_penalty:
+                    continue
+
+                try:
+                    await player.migrate(target)
+                except Exception as error:
+                    print(
+                        f"Could not move player in {player.guild} to {target.identifier}: {error}"
+                    )
+
+    @balance_nodes.before_loop
+    async def before_balance_nodes(self) -> None:
+        await self.bot.wait_until_ready()
+
+    @staticmethod
+    def region(channel: Optional[discord.VoiceChannel]) -> Optional[str]:
+        if channel is None:
+            return None
+
+        region = getattr(channel, "rtc_region", None) or getattr(
+            channel.guild, "region", None
+        )
+        return str(region) if region else None
+
+    @tasks.loop(seconds=2, reconnect=True)
+    async def persist_queues(self) -> None:
+        """
+        |coro|
+
+        A running task loop that writes buffered queue operations
+        and periodically compacts them into a snapshot per guild.
+        """
+        await self.journal.flush()
+
+        compact_all = self.persist_queues.current_loop % 30 == 0
+        for guild in self.bot.guilds:
+            player = guild.voice_client
+            if not isinstance(player, Player):
+                continue
+
+            if self.journal.needs_compaction(guild.id) or (
+                compact_all and player.is_playing()
+            ):
+                await self.journal.compact(player)
+
+    @persist_queues.before_loop
+    async def before_persist_queues(self) -> None:
+        await self.bot.wait_until_ready()
+
+    @persist_queues.after_loop
+    async def after_persist_queues(self) -> None:
+        await self.journal.flush()
 
     async def cog_check(self, ctx: commands.Context):
         bucket = self.cooldown.get_bucket(ctx.message)
@@ -81,22 +703,16 @@ class Music(commands.Cog):
 
     @commands.Cog.listener()
     async def on_wavelink_track_start(self, player: Player, track: wavelink.Track):
-
-        embed = discord.Embed(
-            title=f"Now playing {track.title}", url=track.uri, color=0x2ECC71
-        )
-        embed.set_thumbnail(
-            url=f"https://i.ytimg.com/vi_webp/{track.identifier}/maxresdefault.webp"
-        )
-        embed.set_footer(
-            text=f"Track length: {datetime.timedelta(seconds=track.duration)} | {player.queue.count} tracks in queue."
-        )
-        await player._channel.send(embed=embed, delete_after=15)
+        player.started()
+        player.refresh_idle()
+        player.announce(track)
+        player.schedule_prefetch()
 
     @commands.Cog.listener()
     async def on_wavelink_track_end(
         self, player: Player, track: wavelink.Track, reason: str
     ):
+        player.account()
         if reason == "REPLACED":
             return
 
@@ -127,28 +743,50 @@ class Music(commands.Cog):
         """
         Play a song or playlist from Youtube, Spotify, or Soundcloud.
         """
-        player: Player = context.bot.node.get_player(context.guild)
-        if isinstance(query, list):
-            for track in query:
+        player: Player = context.voice_client
+        if isinstance(query, TrackStream):
+            first = None
+            added = 0
+            started = False
+            async for track in query:
                 try:
                     player.queue.put(track)
                 except TypeError:
-                    pass
+                    continue
 
-            if len(query) > 1:
+                added += 1
+                if first is None:
+                    first = track
+                    position = player.queue.find_position(first) + 1
+                    if not player.is_playing():
+                        await player.next()
+                        started = True
+
+            player.schedule_prefetch()
+            if not added:
+                await context.send(f"No results found.", ephemeral=True)
+
+            elif started:
                 await context.send(
-                    f"Added {query[0].title} + {len(query)} track(s) to the queue. {query[0].title}'s position {player.queue.find_position(query[0]) + 1}/{player.queue.count}.",
+                    f"Playing {first.title}{f' and added {added - 1} track(s) to the queue' if added > 1 else ''}.",
                     delete_after=15,
                 )
 
-            elif len(query) == 1:
+            elif added > 1:
                 await context.send(
-                    f"Added {query[0].title} to the queue. Position {player.queue.find_position(query[0]) + 1}/{player.queue.count}.",
+                    f"Added {first.title} + {added - 1} track(s) to the queue. {first.title}'s position {position}/{player.queue.count}.",
+                    delete_after=15,
+                )
+
+            else:
+                await context.send(
+                    f"Added {first.title} to the queue. Position {position}/{player.queue.count}.",
                     delete_after=15,
                 )
 
         elif query:
             player.queue.put(query)
+            player.schedule_prefetch()
             if player.queue.count >= 1:
                 await context.send(
                     f"Added {query.title} to the queue. Position {player.queue.find_position(query) + 1}/{player.queue.count}.",
@@ -163,11 +801,10 @@ class Music(commands.Cog):
         """
         Display the current song queue.
         """
-        player: Player = context.bot.node.get_player(context.guild)
+        player: Player = context.voice_client
         if player and len(player.queue) >= 1:
-            tracks = await player.tracks()
             await context.send("Retrieving tracks...", ephemeral=True)
-            return await start_menu(context, QueueList(tracks), hidden=False)
+            return await start_menu(context, player.tracks(), hidden=False)
 
         else:
             await context.send("No tracks in queue.", ephemeral=True)
@@ -177,7 +814,7 @@ class Music(commands.Cog):
         """
         Skips the current song.
         """
-        player: Player = context.bot.node.get_player(context.guild)
+        player: Player = context.voice_client
         await context.send("Skipping...", delete_after=5)
         await player.next(True)
 
@@ -186,7 +823,7 @@ class Music(commands.Cog):
         """
         Pauses current song.
         """
-        player: Player = context.bot.node.get_player(context.guild)
+        player: Player = context.voice_client
         if player.is_paused():
             await context.send("Already paused.", ephemeral=True)
 
@@ -199,7 +836,7 @@ class Music(commands.Cog):
         """
         Resumes current song.
         """
-        player: Player = context.bot.node.get_player(context.guild)
+        player: Player = context.voice_client
         if player.is_paused():
             await player.resume()
             await context.send("Resumed song.", delete_after=5)
@@ -207,12 +844,29 @@ class Music(commands.Cog):
         elif player.is_playing():
             await context.send("Already playing.", ephemeral=True)
 
+    @commands.command()
+    async def autoplay(
+        self,
+        context: commands.Context,
+        enabled: bool = commands.Option(
+            description="Whether to queue related tracks when the queue runs out."
+        ),
+    ):
+        """
+        Toggles queueing related tracks once the queue is empty.
+        """
+        player: Player = context.voice_client
+        player.autoplay = enabled
+        await context.send(
+            f"Autoplay {'enabled' if enabled else 'disabled'}.", delete_after=5
+        )
+
     @commands.command()
     async def stop(self, context: commands.Context):
         """
         Clears the queue and stops playing music.
         """
-        player: Player = context.bot.node.get_player(context.guild)
+        player: Player = context.voice_client
         if player:
             await context.send("Exiting...", delete_after=5)
             await player.stop()
@@ -224,16 +878,30 @@ class Music(commands.Cog):
     async def ensure_voice(self, context: commands.Context):
         if context.voice_client is None:
             if context.author.voice:
-                player = Player(context.channel)
+                player = Player(
+                    context.channel,
+                    node=best_node(
+                        context.bot.nodes, self.region(context.author.voice.channel)
+                    ),
+                    journal=self.journal,
+                )
                 vc: Player = await context.author.voice.channel.connect(cls=player)
+                await self.journal.restore(vc)
                 return player
 
             raise commands.CommandError("Author not connected to a voice channel.")
 
-        elif not context.bot.node.get_player(context.guild):
+        elif not isinstance(context.voice_client, Player):
             await context.voice_client.disconnect(force=True)
-            player = Player(context.channel)
+            player = Player(
+                context.channel,
+                node=best_node(
+                    context.bot.nodes, self.region(context.author.voice.channel)
+                ),
+                journal=self.journal,
+            )
             vc: Player = await context.author.voice.channel.connect(cls=player)
+            await self.journal.restore(vc)
             return vc
 
         elif context.voice_client:
@@ -242,12 +910,13 @@ class Music(commands.Cog):
                     f"Author not connected to {context.voice_client.channel.mention}."
                 )
 
+    @autoplay.before_invoke
     @pause.before_invoke
     @resume.before_invoke
     @skip.before_invoke
     @stop.before_invoke
     async def invoke_check(self, context: commands.Context):
-        player: Player = context.bot.node.get_player(context.guild)
+        player: Player = context.voice_client
 
         can_run = dj_perms(context)
         if context.voice_client and player:
@@ -264,7 +933,7 @@ class Music(commands.Cog):
 
     @play.after_invoke
     async def add_track(self, context: commands.Context):
-        player: Player = context.bot.node.get_player(context.guild)
+        player: Player = context.voice_client
         if not player.is_playing():
             await player.next()
 
@@ -1,8 +1,11 @@
+from typing import Optional
+
 import discord
 from discord.ext import commands
 from main import Bot
 
 from cogs.errors import guild_owner, is_admin
+from utils import LogEvent, MessageTemplate
 
 
 class Settings(commands.Cog):
@@ -79,9 +82,14 @@ class Settings(commands.Cog):
             f"{role.mention} has been set as the muted role.", ephemeral=True
         )
 
-    @_settings.command()
+    @_settings.group()
     @is_admin()
-    async def logs(
+    async def logs(self, context: commands.Context):
+        pass
+
+    @logs.command(name="channel")
+    @is_admin()
+    async def logs_channel(
         self,
         context: commands.Context,
         channel: discord.TextChannel = commands.Option(
@@ -97,10 +105,150 @@ class Settings(commands.Cog):
             channel.id,
             context.guild.id,
         )
+        events = context.bot.get_cog("Events")
+        if events:
+            events.logs.pop(context.guild.id, None)
+
         await context.send(
             f"Events will now be logged in {channel.mention}", ephemeral=True
         )
 
+    @logs.command(name="events")
+    @is_admin()
+    async def logs_events(
+        self,
+        context: commands.Context,
+        category: str = commands.Option(
+            None,
+            description=f"One of {', '.join(event.name.lower() for event in LogEvent)}.",
+        ),
+        enabled: bool = commands.Option(
+            None, description="Whether events in this category are logged."
+        ),
+    ):
+        """
+        Choose which categories of events are logged.
+        """
+        current = await context.bot.pool.fetchval(
+            "SELECT log_events FROM guilds WHERE guild = $1", context.guild.id
+        )
+        current = LogEvent.ALL if current is None else LogEvent(current)
+
+        if category is not None:
+            try:
+                event = LogEvent[category.upper()]
+            except KeyError:
+                raise commands.BadArgument(
+                    f"Unknown category. Choose from {', '.join(event.name.lower() for event in LogEvent)}."
+                )
+
+            if enabled is None:
+                enabled = not event & current == event
+
+            current = current | event if enabled else current & ~event
+            await context.bot.pool.execute(
+                "UPDATE guilds SET log_events = $1 WHERE guild = $2",
+                int(current),
+                context.guild.id,
+            )
+            events = context.bot.get_cog("Events")
+            if events:
+                events.logs.pop(context.guild.id, None)
+
+        await context.send(
+            "\n".join(
+                f"{'✅' if event & current == event else '❌'} {event.name.lower()}"
+                for event in LogEvent
+                if event is not LogEvent.ALL
+            ),
+            ephemeral=True,
+        )
+
+    async def member_message(
+        self,
+        context: commands.Context,
+        event: str,
+        channel: Optional[discord.TextChannel],
+        message: Optional[str],
+    ) -> Optional[MessageTemplate]:
+        """
+        |coro|
+
+        Compiles and saves the message sent for `join` or `leave` events,
+        or disables it when no channel or message is given.
+        """
+        template = MessageTemplate(message[:2000]) if channel and message else None
+        if event == "join":
+            await context.bot.pool.execute(
+                "UPDATE guilds SET joins = $1, welcome = $2 WHERE guild = $3",
+                channel.id if template else None,
+                template.template if template else None,
+                context.guild.id,
+            )
+        else:
+            await context.bot.pool.execute(
+                "UPDATE guilds SET leave = $1, goodbye = $2 WHERE guild = $3",
+                channel.id if template else None,
+                template.template if template else None,
+                context.guild.id,
+            )
+
+        events = context.bot.get_cog("Events")
+        if events:
+            events.member_messages[(context.guild.id, event)] = (
+                (channel.id, template) if template else None
+            )
+
+        return template
+
+    @_settings.command()
+    @is_admin()
+    async def welcome(
+        self,
+        context: commands.Context,
+        channel: discord.TextChannel = commands.Option(
+            None, description="Channel to greet new members in."
+        ),
+        message: str = commands.Option(
+            None,
+            description="Message sent when a member joins, e.g. Welcome {user} to {server}!",
+        ),
+    ):
+        """
+        Update the message sent when a member joins.
+        """
+        template = await self.member_message(context, "join", channel, message)
+        await context.send(
+            f"New members will now be welcomed in {channel.mention} with\n\n{template.template}"
+            if template
+            else "No message will be sent when a member joins.",
+            ephemeral=True,
+        )
+
+    @_settings.command()
+    @is_admin()
+    async def goodbye(
+        self,
+        context: commands.Context,
+        channel: discord.TextChannel = commands.Option(
+            None, description="Channel to say goodbye to members in."
+        ),
+        message: str = commands.Option(
+            None,
+            description="Message sent when a member leaves, e.g. {user_name} has left {server}.",
+        ),
+    ):
+        """
+        Update the message sent when a member leaves.
+        """
+        template = await self.member_message(context, "leave", channel, message)
+        await context.send(
+            f"Members leaving will now be announced in {channel.mention} with\n\n{template.template}"
+            if template
+            else "No message will be sent when a member leaves.",
+            ephemeral=True,
+        )
+
     @_settings.group()
     @is_admin()
     async def twitch(self, context: commands.Context):
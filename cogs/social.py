@@ -1,17 +1,228 @@
+import asyncio
+import datetime
+import io
+import mmap
 import os
 import random
 import typing
+import urllib.parse
 
+import aiohttp
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from main import Bot
 
 
+class MappedReader(io.RawIOBase):
+    """
+    A read-only file object over a memory-mapped gif.
+    -----------------------------
+
+    Reads are served from a :class:`memoryview` of the mapping so
+    sending a mapped gif does not copy it onto the heap first, and
+    closing the reader leaves the mapping itself open.
+    """
+
+    def __init__(self, data: mmap.mmap) -> None:
+        super().__init__()
+        self.view = memoryview(data)
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.view)
+
+        self.position = max(0, offset)
+        return self.position
+
+    def readinto(self, buffer: typing.Any) -> int:
+        chunk = self.view[self.position : self.position + len(buffer)]
+        size = len(chunk)
+        memoryview(buffer).cast("B")[:size] = chunk
+        self.position += size
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self.view.release()
+
+        super().close()
+
+
+class GifPool:
+    """
+    An in-memory index of the gifs found in `./gifs/*`.
+    -----------------------------
+
+    Files are read once and kept as :class:`bytes` so sending
+    one is a dict lookup. Files larger than `inline_limit`, or any
+    file read once `memory_cap` has been reached, are memory-mapped
+    instead of being held on the heap.
+    """
+
+    extensions = (".gif",)
+
+    def __init__(
+        self,
+        path: str = "./gifs",
+        *,
+        inline_limit: int = 4 * 1024 * 1024,
+        memory_cap: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.path = path
+        self.inline_limit = inline_limit
+        self.memory_cap = memory_cap
+        self.gifs: dict[str, dict[str, typing.Union[bytes, mmap.mmap]]] = {}
+        self.signatures: dict[str, frozenset[tuple[str, int, int]]] = {}
+
+    @property
+    def memory_usage(self) -> int:
+        return sum(
+            len(data)
+            for gifs in self.gifs.values()
+            for data in gifs.values()
+            if isinstance(data, bytes)
+        )
+
+    def load(self) -> None:
+        """
+        Indexes every category folder, only re-reading folders
+        whose files were added, removed or modified since they
+        were last indexed.
+        """
+        try:
+            categories = [entry for entry in os.scandir(self.path) if entry.is_dir()]
+        except FileNotFoundError:
+            categories = []
+
+        for category in categories:
+            signature = self.signature(category.path)
+            if self.signatures.get(category.name) != signature:
+                self.index(category.name, category.path)
+                self.signatures[category.name] = signature
+
+        for removed in set(self.gifs) - {category.name for category in categories}:
+            self.release(removed)
+            self.signatures.pop(removed, None)
+
+    def signature(self, path: str) -> frozenset[tuple[str, int, int]]:
+        """
+        Returns the name, mtime and size of every gif in a folder.
+        Directory mtimes only change when entries are added or
+        removed, so in-place overwrites are caught by the file mtimes.
+        """
+        signature = set()
+        for entry in os.scandir(path):
+            if entry.is_file() and entry.name.lower().endswith(self.extensions):
+                stat = entry.stat()
+                signature.add((entry.name, stat.st_mtime_ns, stat.st_size))
+
+        return frozenset(signature)
+
+    def index(self, category: str, path: str) -> None:
+        """
+        Reads all gifs within a category folder
+        and replaces the existing entries for it.
+        """
+        used = self.memory_usage - sum(
+            len(data)
+            for data in self.gifs.get(category, {}).values()
+            if isinstance(data, bytes)
+        )
+
+        gifs: dict[str, typing.Union[bytes, mmap.mmap]] = {}
+        for entry in os.scandir(path):
+            if not entry.is_file() or not entry.name.lower().endswith(self.extensions):
+                continue
+
+            size = entry.stat().st_size
+            if not size:
+                continue
+
+            with open(entry.path, "rb") as fp:
+                if size <= self.inline_limit and used + size <= self.memory_cap:
+                    gifs[entry.name] = fp.read()
+                    used += size
+                else:
+                    gifs[entry.name] = mmap.mmap(
+                        fp.fileno(), 0, access=mmap.ACCESS_READ
+                    )
+
+        previous = self.gifs.get(category, {})
+        self.gifs[category] = gifs
+        self.unmap(previous)
+
+    def release(self, category: str) -> None:
+        self.unmap(self.gifs.pop(category, {}))
+
+    @staticmethod
+    def unmap(gifs: dict[str, typing.Union[bytes, mmap.mmap]]) -> None:
+        for data in gifs.values():
+            if isinstance(data, mmap.mmap):
+                try:
+                    data.close()
+                except BufferError:
+                    # Still being sent, the mapping is freed with its last reader.
+                    pass
+
+    def close(self) -> None:
+        for category in list(self.gifs):
+            self.release(category)
+
+    def random(self, category: str) -> typing.Optional[str]:
+        """
+        Returns the key of a random gif from a category
+        or `None` if the category has no gifs.
+        """
+        gifs = self.gifs.get(category)
+        if not gifs:
+            return None
+
+        return f"{category}/{random.choice(tuple(gifs))}"
+
+    def get(self, gif: str) -> typing.Optional[typing.Union[bytes, mmap.mmap]]:
+        """
+        Returns the data of a key given by :method:`random`,
+        or `None` if it is no longer indexed.
+        """
+        category, name = gif.split("/", 1)
+        return self.gifs.get(category, {}).get(name)
+
+    def file(self, gif: str) -> discord.File:
+        """
+        Returns a :class:`discord.File` for a key given by :method:`random`.
+        """
+        category, name = gif.split("/", 1)
+        data = self.gifs[category][name]
+        # BytesIO shares the buffer of a bytes object until it is written to,
+        # mapped files are read through a view instead of being copied.
+        fp = io.BytesIO(data) if isinstance(data, bytes) else MappedReader(data)
+        return discord.File(fp=fp, filename=f"{category}.gif")
+
+
 class Social(commands.Cog):
     """A module with various reactions."""
 
     def __init__(self, bot: Bot):
         self.bot = bot
+        self.gifs = GifPool()
+        self.gifs.load()
+        self.urls: dict[str, tuple[str, typing.Optional[datetime.datetime]]] = {}
+        self.revalidate_after = datetime.timedelta(hours=6)
+        self.expiry_margin = datetime.timedelta(minutes=5)
+        self.watch_gifs.start()
+        self.bot.loop.create_task(self.__ainit__())
         self.emotions = [
             "hungry",
             "bored",
@@ -46,19 +257,58 @@ class Social(commands.Cog):
             "yay": ["excited", "joyful", "thrilled"],
         }
 
+    async def __ainit__(self) -> None:
+        """
+        |coro|
+
+        An asynchronous version of :method:`__init__`
+        to access coroutines.
+        """
+        self.urls.update(
+            {
+                gif: (url, validated)
+                for gif, url, validated in await self.bot.pool.fetch(
+                    "SELECT gif, url, validated FROM gifs"
+                )
+            }
+        )
+
+    def cog_unload(self) -> None:
+        """
+        This method is called before the extension is unloaded
+        to stop watching the gif folders and release mapped files.
+        """
+        self.watch_gifs.cancel()
+        self.gifs.close()
+        super().cog_unload()
+
+    @tasks.loop(seconds=60)
+    async def watch_gifs(self) -> None:
+        """
+        |coro|
+
+        A running task loop that re-indexes gif folders
+        which have had files added or removed.
+        """
+        await self.bot.loop.run_in_executor(None, self.gifs.load)
+
+    @watch_gifs.before_loop
+    async def before_watch_gifs(self) -> None:
+        await self.bot.wait_until_ready()
+
     def __emotion__(self) -> str:
         return random.choice(self.emotions)
 
     def __action__(self, cmd: str) -> str:
         return random.choice(self.actions[cmd])
 
-    @staticmethod
     async def __embed__(
+        self,
         context: commands.Context,
         cmd: str,
-        image: typing.Union[str, discord.File],
         title: str = None,
     ) -> None:
+        gif, image = await self.__react__(cmd)
         if isinstance(image, str):
             embed: discord.Embed = context.bot.embed(color=0x2ECC71)
             if title:
@@ -70,13 +320,118 @@ class Social(commands.Cog):
             embed: discord.Embed = context.bot.embed(color=0x2ECC71)
             if title:
                 embed.title = title
-            embed.set_image(url=f"attachment://{cmd}.gif")
-            await context.send(file=image, embed=embed)
+            embed.set_image(url=f"attachment://{image.filename}")
+            message: typing.Optional[discord.Message] = await context.send(
+                file=image, embed=embed
+            )
+            await self.remember(gif, message)
+
+    async def __react__(self, cmd: str) -> tuple[str, typing.Union[str, discord.File]]:
+        gif = self.gifs.random(cmd)
+        if not gif:
+            raise commands.CommandError(f"No gifs are available for {cmd} right now.")
+
+        cached = self.urls.get(gif)
+        if cached:
+            url, validated = cached
+            now = discord.utils.utcnow()
+            expires = self.expires(url)
+            if expires is not None and expires - now <= self.expiry_margin:
+                await self.forget(gif)
+            elif validated is not None and now - validated < self.revalidate_after:
+                return gif, url
+            elif await self.revalidate(gif, url):
+                return gif, url
+
+            # The folder may have been re-indexed while the url was checked.
+            if self.gifs.get(gif) is None:
+                gif = self.gifs.random(cmd)
+                if not gif:
+                    raise commands.CommandError(
+                        f"No gifs are available for {cmd} right now."
+                    )
+
+        return gif, self.gifs.file(gif)
+
+    @staticmethod
+    def expires(url: str) -> typing.Optional[datetime.datetime]:
+        """
+        Returns when a signed CDN url stops resolving,
+        taken from its hexadecimal `ex` query parameter.
+        """
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)
+        try:
+            return datetime.datetime.fromtimestamp(
+                int(query["ex"][0], 16), tz=datetime.timezone.utc
+            )
+        except (KeyError, ValueError, OverflowError, OSError):
+            return None
+
+    async def remember(
+        self, gif: str, message: typing.Optional[discord.Message]
+    ) -> None:
+        """
+        |coro|
+
+        Stores the CDN url of an uploaded gif so later
+        uses can link to it instead of uploading it again.
+        """
+        if not isinstance(message, discord.Message):
+            return
+
+        if message.embeds and message.embeds[0].image.url:
+            url = message.embeds[0].image.url
+        elif message.attachments:
+            url = message.attachments[0].url
+        else:
+            return
+
+        validated = discord.utils.utcnow()
+        self.urls[gif] = (url, validated)
+        await self.bot.pool.execute(
+            "INSERT INTO gifs (gif, url, validated) VALUES ($1, $2, $3) ON CONFLICT (gif) DO UPDATE SET url = $2, validated = $3",
+            gif,
+            url,
+            validated,
+        )
+
+    async def revalidate(self, gif: str, url: str) -> bool:
+        """
+        |coro|
+
+        Checks that a stored CDN url still resolves and returns
+        whether it can be linked. The url is only forgotten when the
+        CDN reports it gone, rate limits and outages keep it.
+        """
+        try:
+            async with self.bot.cs.head(
+                url, timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
+                status = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return True
+
+        if status in (403, 404):
+            await self.forget(gif)
+            return False
+
+        if status == 200:
+            validated = discord.utils.utcnow()
+            self.urls[gif] = (url, validated)
+            await self.bot.pool.execute(
+                "UPDATE gifs SET validated = $1 WHERE gif = $2", validated, gif
+            )
+
+        return True
+
+    async def forget(self, gif: str) -> None:
+        """
+        |coro|
 
-    def __react__(self, cmd: str):
-        gif = random.choice(os.listdir(f"./gifs/{cmd}")[1:])
-        with open(f"./gifs/{cmd}/" + gif, "rb") as fp:
-            return discord.File(fp=fp, filename=f"{cmd}.gif")
+        Drops a stored CDN url so the gif is uploaded again on next use.
+        """
+        self.urls.pop(gif, None)
+        await self.bot.pool.execute("DELETE FROM gifs WHERE gif = $1", gif)
 
     @commands.group(name="rp")
     async def _rp(self, context: commands.Context) -> None:
@@ -91,8 +446,7 @@ class Social(commands.Cog):
         """Take a bite out of someone."""
         await self.__embed__(
             context,
-            context.command,
-            self.__react__(context.command.name),
+            context.command.name,
             f"{context.author} got {self.__emotion__()} and decided to {self.__action__(context.command.name)} {member}",
         )
 
@@ -101,8 +455,7 @@ class Social(commands.Cog):
         """React with a blushing gif."""
         await self.__embed__(
             context,
-            context.command,
-            self.__react__(context.command.name),
+            context.command.name,
             f"{context.author} {context.command.name}ed",
         )
 
@@ -117,8 +470,7 @@ class Social(commands.Cog):
         """ "Give a user a warm hug."""
         await self.__embed__(
             context,
-            context.command,
-            self.__react__(context.command.name),
+            context.command.name,
             f"{context.author} got {self.__emotion__()} and decided to {self.__action__(context.command.name)} {member}",
         )
 
@@ -136,8 +488,7 @@ class Social(commands.Cog):
 
         await self.__embed__(
             context,
-            context.command,
-            self.__react__(context.command.name),
+            context.command.name,
             f"{context.author} got {self.__emotion__()} and decided to {self.__action__(context.command.name)} {member}",
         )
 
@@ -150,8 +501,7 @@ class Social(commands.Cog):
         """Give a smooch to that special someone."""
         await self.__embed__(
             context,
-            context.command,
-            self.__react__(context.command.name),
+            context.command.name,
             f"{context.author} got {self.__emotion__()} and decided to {self.__action__(context.command.name)} {member}",
         )
 
@@ -160,8 +510,7 @@ class Social(commands.Cog):
         """React with a laughing gif."""
         await self.__embed__(
             context,
-            context.command,
-            self.__react__(context.command.name),
+            context.command.name,
             f"{context.author} {context.command.name}ed",
         )
 
@@ -170,8 +519,7 @@ class Social(commands.Cog):
         """React with an angry/mad gif possessed by your anger."""
         await self.__embed__(
             context,
-            context.command,
-            self.__react__(context.command.name),
+            context.command.name,
             f"{context.author} is {context.command.name}",
         )
 
@@ -180,8 +528,7 @@ class Social(commands.Cog):
         """React with a gif full of your sadness."""
         await self.__embed__(
             context,
-            context.command,
-            self.__react__(context.command.name),
+            context.command.name,
             f"{context.author} is {context.command.name}",
         )
 
@@ -194,8 +541,7 @@ class Social(commands.Cog):
         """Slap a user into the next life."""
         await self.__embed__(
             context,
-            context.command,
-            self.__react__(context.command.name),
+            context.command.name,
             f"{context.author} got {self.__emotion__()} and decided to {self.__action__(context.command.name)} {member}",
         )
 
@@ -204,8 +550,7 @@ class Social(commands.Cog):
         """React with a sleep-deprived, tired gif."""
         await self.__embed__(
             context,
-            context.command,
-            self.__react__(context.command.name),
+            context.command.name,
             f"{context.author} is feeling {self.__action__(context.command.name)}",
         )
 
@@ -214,8 +559,7 @@ class Social(commands.Cog):
         """React with a gif full of joy."""
         await self.__embed__(
             context,
-            context.command,
-            self.__react__(context.command.name),
+            context.command.name,
             f"{context.author} is feeling {self.__action__(context.command.name)}",
         )
 
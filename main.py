@@ -13,6 +13,7 @@ from discord.ext import commands
 from wavelink.ext import spotify
 
 from postgre import Database
+from utils import BanIndex, TrackCache
 
 
 class Bot(commands.Bot):
@@ -47,17 +48,33 @@ class Bot(commands.Bot):
         opened on initialization to allow for
         continued use without having to open and
         close connections.
+
+    nodes: List[:class:`wavelink.Node`]
+        The Lavalink nodes created from every
+        `LAVALINK` section of the config file.
+
+    track_cache: :class:`TrackCache`
+        Resolved tracks shared across all
+        servers to avoid repeated lookups.
+
+    bans: :class:`BanIndex`
+        Each server's ban list, fetched once
+        and kept current from ban events.
     """
 
     def __init__(self) -> None:
 
+        # members is privileged and must also be
+        # enabled for the application in the developer portal.
         intents = discord.Intents(
             guilds=True,
+            members=True,
             emojis_and_stickers=True,
             invites=True,
             voice_states=True,
             guild_messages=True,
             guild_reactions=True,
+            bans=True,
         )
 
         super().__init__(
@@ -117,7 +134,8 @@ class Bot(commands.Bot):
         """
         await asyncio.wait_for(self.cs.close(), 30)
         await asyncio.wait_for(self.pool.close(), 30)
-        await asyncio.wait_for(self.node.disconnect(), 30)
+        for node in self.nodes:
+            await asyncio.wait_for(node.disconnect(), 30)
         await super().close()
 
     def extensions(self) -> None:
@@ -148,17 +166,24 @@ class Bot(commands.Bot):
         self.uptime = discord.utils.utcnow()
         self.embed = discord.Embed
         self.cs = aiohttp.ClientSession()
-        self.node = await wavelink.NodePool.create_node(
-            bot=self,
-            host=bot.config["LAVALINK"]["host"],
-            port=int(bot.config["LAVALINK"]["port"]),
-            password=bot.config["LAVALINK"]["password"],
-            region=bot.config["LAVALINK"]["region"],
-            spotify_client=spotify.SpotifyClient(
-                client_id=bot.config["SPOTIFY"]["client_id"],
-                client_secret=bot.config["SPOTIFY"]["client_secret"],
-            ),
+        spotify_client = spotify.SpotifyClient(
+            client_id=self.config["SPOTIFY"]["client_id"],
+            client_secret=self.config["SPOTIFY"]["client_secret"],
         )
+        # Every [LAVALINK] or [LAVALINK.<name>] section is its own node.
+        self.nodes: List[wavelink.Node] = [
+            await wavelink.NodePool.create_node(
+                bot=self,
+                host=self.config[section]["host"],
+                port=int(self.config[section]["port"]),
+                password=self.config[section]["password"],
+                region=self.config[section]["region"],
+                identifier=section,
+                spotify_client=spotify_client,
+            )
+            for section in self.config.sections()
+            if section == "LAVALINK" or section.startswith("LAVALINK.")
+        ]
 
     async def on_ready(self) -> None:
         """
@@ -283,7 +308,13 @@ class Bot(commands.Bot):
         """
         self.cache: dict[str, dict[int, Union[discord.Member, discord.User]]] = {"member": {}, "user": {}}  # type: ignore
 
-        self.guild_bans: dict[int, dict] = {}
+        self.bans = BanIndex()
+
+        self.track_cache = TrackCache(
+            self.pool
+            if self.config.getboolean("LAVALINK", "cache_tracks", fallback=False)
+            else None
+        )
 
         self.prefix: dict[int, str] = {
             guild: prefix
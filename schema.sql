@@ -11,6 +11,7 @@ CREATE TABLE IF NOT EXISTS guilds (
     welcome text,
     goodbye text,
     ticket_message text,
+    log_events bigint,
     CONSTRAINT guilds_pkey PRIMARY KEY (guild)
 );
 
@@ -60,4 +61,48 @@ CREATE TABLE IF NOT EXISTS lastfm (
     user_id bigint NOT NULL,
     lastfm_user text,
     CONSTRAINT lastfm_pkey PRIMARY KEY (user_id)
-);
\ No newline at end of file
+);
+
+CREATE TABLE IF NOT EXISTS gifs (
+    gif text NOT NULL,
+    url text,
+    validated timestamp with time zone,
+    CONSTRAINT gifs_pkey PRIMARY KEY (gif)
+);
+
+CREATE TABLE IF NOT EXISTS tracks (
+    query text NOT NULL,
+    kind text,
+    track text,
+    info text,
+    cached timestamp with time zone,
+    CONSTRAINT tracks_pkey PRIMARY KEY (query)
+);
+
+CREATE TABLE IF NOT EXISTS music_queues (
+    guild bigint NOT NULL,
+    channel bigint,
+    tracks text,
+    current text,
+    position bigint,
+    updated timestamp with time zone,
+    CONSTRAINT music_queues_pkey PRIMARY KEY (guild)
+);
+
+CREATE TABLE IF NOT EXISTS music_queue_ops (
+    id bigserial,
+    guild bigint,
+    op text,
+    position bigint,
+    track text,
+    CONSTRAINT music_queue_ops_pkey PRIMARY KEY (id)
+);
+
+CREATE TABLE IF NOT EXISTS lockdowns (
+    guild bigint NOT NULL,
+    channel bigint NOT NULL,
+    allow bigint,
+    deny bigint,
+    locked timestamp with time zone,
+    CONSTRAINT lockdowns_pkey PRIMARY KEY (guild, channel)
+);
@@ -0,0 +1,97 @@
+import asyncio
+import types
+
+import wavelink
+
+from cogs.music import Queue, QueueJournal
+
+guild = 1
+
+
+class Connection:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def transaction(self):
+        return self
+
+    async def execute(self, query, *args):
+        await self.pool.execute(query, *args)
+
+
+class Pool:
+    """Keeps the rows QueueJournal writes for a single guild in memory."""
+
+    def __init__(self):
+        self.snapshot = None
+        self.ops = []
+
+    async def executemany(self, query, rows):
+        self.ops.extend((op, position, track) for _, op, position, track in rows)
+
+    async def fetchrow(self, query, *args):
+        return self.snapshot
+
+    async def fetch(self, query, *args):
+        return list(self.ops)
+
+    async def execute(self, query, *args):
+        if query.startswith("INSERT INTO music_queues"):
+            self.snapshot = {"tracks": args[2], "current": args[3], "position": args[4]}
+        elif "music_queue_ops" in query:
+            self.ops.clear()
+        else:
+            self.snapshot = None
+
+    def acquire(self):
+        return Connection(self)
+
+
+def track(name):
+    return wavelink.Track(name, {"title": name, "length": 1000})
+
+
+def player():
+    channel = types.SimpleNamespace(id=2, guild=types.SimpleNamespace(id=guild))
+    return types.SimpleNamespace(
+        _channel=channel, queue=Queue(), source=None, position=0, resume_from=None
+    )
+
+
+def journaled(journal):
+    queue = Queue()
+    queue.journal = lambda op, item, index: journal.record(guild, op, item, index)
+    return queue
+
+
+def restored(journal):
+    restored = player()
+    asyncio.run(journal.restore(restored))
+    return [item.id for item in restored.queue]
+
+
+def test_extend_is_journaled_once():
+    journal = QueueJournal(Pool())
+    queue = journaled(journal)
+    queue.extend([track("a"), track("b"), track("c")])
+
+    assert len(journal.pending) == 3
+    assert restored(journal) == ["a", "b", "c"]
+
+
+def test_put_at_front_is_journaled_once():
+    journal = QueueJournal(Pool())
+    queue = journaled(journal)
+    queue.put(track("a"))
+    queue.put_at_front(track("b"))
+    queue.extend([track("c")])
+    queue.put_at_front(track("d"))
+
+    assert len(journal.pending) == 4
+    assert restored(journal) == ["d", "b", "a", "c"]
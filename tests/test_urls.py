@@ -0,0 +1,68 @@
+import pytest
+
+from utils import TrackURL, classify_url
+
+urls = [
+    (
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        TrackURL("youtube", "track", "dQw4w9WgXcQ"),
+    ),
+    (
+        "https://youtu.be/dQw4w9WgXcQ?si=abc123",
+        TrackURL("youtube", "track", "dQw4w9WgXcQ"),
+    ),
+    ("youtu.be/dQw4w9WgXcQ", TrackURL("youtube", "track", "dQw4w9WgXcQ")),
+    (
+        "https://music.youtube.com/watch?v=abc-_12&list=PLx&index=4&si=zz",
+        TrackURL("youtube", "track", "abc-_12", "PLx", 4),
+    ),
+    (
+        "https://www.youtube.com/playlist?list=PL123&si=q",
+        TrackURL("youtube", "playlist", None, "PL123"),
+    ),
+    (
+        "https://m.youtube.com/watch?list=PL1&v=X1&index=x",
+        TrackURL("youtube", "track", "X1", "PL1"),
+    ),
+    ("https://www.youtube.com/watch?v=&list=", None),
+    ("https://www.youtube.com/shorts/abcd", TrackURL("youtube", "track", "abcd")),
+    (
+        "https://www.youtube.com/embed/abcd?start=3",
+        TrackURL("youtube", "track", "abcd"),
+    ),
+    ("https://www.youtube.com/channel/UC", None),
+    (
+        "https://open.spotify.com/track/4uLU6hMCjMI75M1A2tKUQC?si=abcdef",
+        TrackURL("spotify", "track", "4uLU6hMCjMI75M1A2tKUQC"),
+    ),
+    (
+        "https://open.spotify.com/intl-de/album/1A2b",
+        TrackURL("spotify", "album", "1A2b"),
+    ),
+    ("spotify:playlist:37i9", TrackURL("spotify", "playlist", "37i9")),
+    ("spotify:artist:1", None),
+    ("https://open.spotify.com/artist/1", None),
+    (
+        "https://soundcloud.com/artist/song?si=abc&utm_source=x",
+        TrackURL("soundcloud", "track", "artist/song"),
+    ),
+    (
+        "https://soundcloud.com/artist/sets/mix?si=1",
+        TrackURL("soundcloud", "playlist", "artist/sets/mix"),
+    ),
+    (
+        "https://m.soundcloud.com/artist/song",
+        TrackURL("soundcloud", "track", "artist/song"),
+    ),
+    ("never gonna give you up", None),
+    ("rick astley", None),
+    ("https://example.com/watch?v=1", None),
+    ("http://[::1", None),
+    ("https://notyoutube.com/watch?v=1", None),
+    ("mr.brightside", None),
+]
+
+
+@pytest.mark.parametrize("argument, expected", urls)
+def test_classify_url(argument, expected):
+    assert classify_url(argument) == expected
@@ -1,8 +1,31 @@
+import asyncio
+import bisect
+import collections
 import contextlib
+import datetime
+import difflib
+import enum
+import functools
+import itertools
+import json
 import random
 import re
+import string
 import uuid
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+from urllib.parse import unquote, urlsplit
 
 import discord
 from discord.ext import commands, menus
@@ -150,14 +173,70 @@ class HelpMenu(menus.ListPageSource):
         return entries
 
 
-class QueueList(menus.ListPageSource):
-    def __init__(self, data: list) -> None:
-        super().__init__(data, per_page=1)
+class QueuePages(menus.PageSource):
+    """
+    Returns a pagination of a snapshot of a player's queue.
+    -----------------------------
+
+    Pages are only rendered when they are shown and are kept in
+    `cache`, keyed by the queue `version` the snapshot was taken at,
+    so reopening an unchanged queue does not format it again.
+    """
+
+    yt_url = "https://www.youtube.com/results?search_query="
+
+    def __init__(
+        self,
+        tracks: Tuple[wavelink.abc.Playable, ...],
+        version: int,
+        cache: Dict[Tuple[int, int], discord.Embed],
+        per_page: int = 10,
+    ) -> None:
+        self.tracks = tracks
+        self.version = version
+        self.cache = cache
+        self.per_page = per_page
+
+    def is_paginating(self) -> bool:
+        return len(self.tracks) > self.per_page
+
+    def get_max_pages(self) -> int:
+        return max(1, -(-len(self.tracks) // self.per_page))
+
+    async def get_page(self, page_number: int) -> discord.Embed:
+        key = (self.version, page_number)
+        embed = self.cache.get(key)
+        if embed is None:
+            embed = self.cache[key] = self.render(page_number)
+
+        return embed
+
+    def render(self, page_number: int) -> discord.Embed:
+        start = page_number * self.per_page
+        lines = []
+        for index, track in enumerate(
+            self.tracks[start : start + self.per_page], start=start + 1
+        ):
+            if isinstance(track, wavelink.PartialTrack):
+                url = f"{self.yt_url}{track.query}".replace(" ", "+")
+                lines.append(f"{index}. [{track.query}]({url})")
+            else:
+                lines.append(
+                    f"{index}. [{track.info['title']}]({track.info['uri']}) - {datetime.timedelta(seconds=track.duration)}"
+                )
+
+        embed = discord.Embed(
+            title=f"{len(self.tracks)} songs in queue",
+            description="\n".join(lines),
+            color=0x2ECC71,
+        )
+        embed.set_footer(text=f"Page {page_number + 1}/{self.get_max_pages()}")
+        return embed
 
     async def format_page(
-        self, menu: menus.MenuPages, entries: List[discord.Embed]
+        self, menu: menus.MenuPages, page: discord.Embed
     ) -> Union[str, discord.Embed, dict]:
-        return entries
+        return page
 
 
 ### Converters
@@ -316,153 +395,1026 @@ class UserConverter(commands.Converter):
         return None
 
 
+class BanList:
+    """
+    The banned users of a single guild.
+    -----------------------------
+
+    users: Dict[:class:`int`, :class:`discord.abc.User`]
+        Each banned user by id.
+
+    names: Dict[:class:`str`, :class:`int`]
+        The id of each banned user by lowercased `name#discriminator`.
+
+    keys: List[:class:`str`]
+        The keys of `names`, sorted for prefix searches.
+    """
+
+    __slots__ = ("users", "names", "keys")
+
+    def __init__(self, users: Iterable[discord.abc.User] = ()) -> None:
+        self.users: Dict[int, discord.abc.User] = {user.id: user for user in users}
+        self.names: Dict[str, int] = {
+            str(user).lower(): id for id, user in self.users.items()
+        }
+        self.keys: List[str] = sorted(self.names)
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self.users
+
+    def add(self, user: discord.abc.User) -> None:
+        self.remove(user.id)
+        name = str(user).lower()
+        self.users[user.id] = user
+        self.names[name] = user.id
+        bisect.insort(self.keys, name)
+
+    def remove(self, user_id: int) -> None:
+        user = self.users.pop(user_id, None)
+        if user is None:
+            return
+
+        name = str(user).lower()
+        self.names.pop(name, None)
+        index = bisect.bisect_left(self.keys, name)
+        if index < len(self.keys) and self.keys[index] == name:
+            del self.keys[index]
+
+    def prefix(self, query: str, limit: int = 5) -> List[int]:
+        """
+        Returns up to `limit` ids whose name starts with `query`.
+        """
+        query = query.lower()
+        matches = []
+        for key in itertools.islice(
+            self.keys, bisect.bisect_left(self.keys, query), None
+        ):
+            if not key.startswith(query) or len(matches) == limit:
+                break
+
+            matches.append(self.names[key])
+
+        return matches
+
+    def search(self, query: str, limit: int = 5) -> List[int]:
+        """
+        Returns up to `limit` ids whose name starts with or closely
+        resembles `query`, best matches first.
+        """
+        matches = self.prefix(query, limit)
+        if len(matches) < limit:
+            for key in difflib.get_close_matches(
+                query.lower(), self.keys, n=limit, cutoff=0.6
+            ):
+                if self.names[key] not in matches:
+                    matches.append(self.names[key])
+
+        return matches[:limit]
+
+    def find(self, query: str) -> Optional[discord.abc.User]:
+        """
+        Returns the banned user with an id, mention or exact
+        `name#discriminator` of `query`. Partial names are left
+        to :meth:`search` so they are only ever suggested.
+        """
+        query = query.strip()
+        user_id = query.strip("<@!>")
+        if user_id.isdigit():
+            return self.users.get(int(user_id))
+
+        exact = self.names.get(query.lower())
+        return self.users[exact] if exact else None
+
+
+class BanIndex:
+    """
+    A :class:`BanList` per guild, fetched once and kept current
+    from `on_member_ban` and `on_member_unban`.
+    """
+
+    def __init__(self) -> None:
+        self.guilds: Dict[int, BanList] = {}
+        self.locks: Dict[int, asyncio.Lock] = {}
+
+    async def get(self, guild: discord.Guild) -> BanList:
+        """
+        |coro|
+
+        Returns the guild's ban list, fetching it the first time.
+        """
+        bans = self.guilds.get(guild.id)
+        if bans is not None:
+            return bans
+
+        async with self.locks.setdefault(guild.id, asyncio.Lock()):
+            if guild.id not in self.guilds:
+                entries: List[discord.guild.BanEntry] = await guild.bans()
+                self.guilds[guild.id] = BanList(entry.user for entry in entries)
+
+        self.locks.pop(guild.id, None)
+        return self.guilds[guild.id]
+
+    def add(self, guild: int, user: discord.abc.User) -> None:
+        bans = self.guilds.get(guild)
+        if bans is not None:
+            bans.add(user)
+
+    def remove(self, guild: int, user: int) -> None:
+        bans = self.guilds.get(guild)
+        if bans is not None:
+            bans.remove(user)
+
+    def discard(self, guild: int) -> None:
+        self.guilds.pop(guild, None)
+
+
 class BannedUserConverter(commands.Converter):
     """
-    Attemps to return a User object through
-    local and/or global lookups.
+    Attemps to return a User object from the guild's ban list
+    by id, mention or exact name, suggesting close names otherwise.
     """
 
     async def convert(
         self, context: commands.Context, argument: str
-    ) -> Optional[discord.Object]:
-
-        all_guild_bans: dict[int, dict[str, int]] = context.bot.guild_bans
-        guild_ban_entries = all_guild_bans.get(context.guild.id)
-        if guild_ban_entries:
-            banned_user = guild_ban_entries.get(argument)
-            if banned_user:
-                return discord.Object(banned_user)
-
-        ban_entries: List[discord.guild.BanEntry] = await context.guild.bans()
-        guild_bans = {str(ban.user): ban.user.id for ban in ban_entries}
-        context.bot.guild_bans.update({context.guild.id: guild_bans})
-        banned_user = guild_bans.get(argument)
+    ) -> discord.abc.User:
+        bans: BanList = await context.bot.bans.get(context.guild)
+        banned_user = bans.find(argument)
         if banned_user:
-            return discord.Object(banned_user)
+            return banned_user
+
+        suggestions = bans.search(argument)
+        if suggestions:
+            raise commands.BadArgument(
+                f"No banned user named {argument}. Did you mean {', '.join(f'`{bans.users[user]}`' for user in suggestions)}?"
+            )
+
+        raise commands.UserNotFound(argument)
 
 
-youtube_regex = re.compile(
-    r"[&?]list=([^&]+)?|((?:youtube\.com|youtu.be))(\/(?:[\w\-]+\?v=|embed\/|v\/)?)([\w\-]+)(\S+)?"
+class JoinIndex:
+    """
+    The join times of each guild's members, kept sorted so a
+    member's join position is a binary search away.
+    -----------------------------
+
+    guilds: Dict[:class:`int`, List[:class:`float`]]
+        Sorted join timestamps by guild id. Guilds are only indexed
+        the first time a position is requested.
+    """
+
+    def __init__(self) -> None:
+        self.guilds: Dict[int, List[float]] = {}
+
+    def build(self, guild: discord.Guild) -> List[float]:
+        times = sorted(
+            member.joined_at.timestamp()
+            for member in guild.members
+            if member.joined_at is not None
+        )
+        self.guilds[guild.id] = times
+        return times
+
+    def add(self, member: discord.Member) -> None:
+        times = self.guilds.get(member.guild.id)
+        if times is not None and member.joined_at is not None:
+            bisect.insort(times, member.joined_at.timestamp())
+
+    def remove(self, member: discord.Member) -> None:
+        times = self.guilds.get(member.guild.id)
+        if times is None or member.joined_at is None:
+            return
+
+        joined = member.joined_at.timestamp()
+        index = bisect.bisect_left(times, joined)
+        if index < len(times) and times[index] == joined:
+            del times[index]
+
+    def discard(self, guild: int) -> None:
+        self.guilds.pop(guild, None)
+
+    def position(self, member: discord.Member) -> int:
+        """
+        Returns the 1-based position `member` joined their guild in.
+        """
+        times = self.guilds.get(member.guild.id)
+        if times is None:
+            times = self.build(member.guild)
+
+        if member.joined_at is None:
+            return len(times)
+
+        return bisect.bisect_left(times, member.joined_at.timestamp()) + 1
+
+
+member_placeholders = frozenset(
+    {
+        "user",
+        "user_id",
+        "user_name",
+        "user_discriminator",
+        "user_avatar",
+        "user_bot",
+        "user_position",
+        "user_created_at",
+        "server",
+        "server_id",
+        "server_icon",
+        "server_owner_id",
+        "server_owner",
+        "server_region",
+        "server_members",
+        "server_verification",
+        "server_joined_at",
+        "server_created_at",
+        "channel",
+        "channel_name",
+        "channel_id",
+        "channel_type",
+    }
 )
-spotify_regex = re.compile(
-    r"https?://open.spotify.com/(?P<type>album|playlist|track)/(?P<id>[a-zA-Z0-9]+)"
+
+
+class MessageTemplate:
+    """
+    A welcome or goodbye message with its placeholders parsed once.
+    -----------------------------
+
+    template: :class:`str`
+        The raw message.
+
+    parts: List[Tuple[:class:`str`, Optional[:class:`str`], :class:`str`, Optional[:class:`str`]]]
+        The literal text, placeholder, format spec and conversion
+        of each segment, as returned by `string.Formatter.parse`.
+    """
+
+    formatter = string.Formatter()
+
+    def __init__(self, template: str) -> None:
+        try:
+            parts = list(self.formatter.parse(template))
+        except ValueError as error:
+            raise commands.BadArgument(f"Invalid message: {error}.")
+
+        unknown = {
+            field
+            for _, field, _, _ in parts
+            if field is not None and field not in member_placeholders
+        }
+        if unknown:
+            raise commands.BadArgument(
+                f"Unknown placeholder(s): {', '.join(f'{{{field}}}' for field in sorted(unknown))}"
+            )
+
+        self.template = template
+        self.parts = parts
+
+    def render(self, values: Dict[str, Callable[[], Any]]) -> str:
+        """
+        Fills in the placeholders, only evaluating the
+        values the message actually uses.
+        """
+        rendered = []
+        for literal, field, spec, conversion in self.parts:
+            rendered.append(literal)
+            if field is not None:
+                value = values[field]()
+                if conversion:
+                    value = self.formatter.convert_field(value, conversion)
+                rendered.append(format(value, spec or ""))
+
+        return "".join(rendered)
+
+
+class LogEvent(enum.IntFlag):
+    """
+    The categories of events a guild can choose to have logged.
+    """
+
+    MESSAGES = 1 << 0
+    CHANNELS = 1 << 1
+    THREADS = 1 << 2
+    MEMBERS = 1 << 3
+    PRESENCES = 1 << 4
+    USERS = 1 << 5
+    SERVER = 1 << 6
+    ROLES = 1 << 7
+    EMOJIS = 1 << 8
+    VOICE = 1 << 9
+    STAGES = 1 << 10
+    BANS = 1 << 11
+    INVITES = 1 << 12
+    ALL = (1 << 13) - 1
+
+
+def _permission_labels() -> Dict[int, str]:
+    labels: Dict[int, str] = {}
+    for name, value in discord.Permissions.VALID_FLAGS.items():
+        labels.setdefault(
+            value, name.replace("_", " ").replace("guild", "server").title()
+        )
+
+    return labels
+
+
+permission_labels = _permission_labels()
+
+
+def permission_names(value: int) -> List[str]:
+    """
+    Returns the display names of every permission bit set in `value`.
+    """
+    names = []
+    while value:
+        bit = value & -value
+        names.append(permission_labels.get(bit, f"Unknown ({bit})"))
+        value ^= bit
+
+    return names
+
+
+class PermissionDiff(NamedTuple):
+    """
+    The permission bits of an overwrite that changed.
+    -----------------------------
+
+    target: :class:`int`
+        The role or member the overwrite applies to.
+
+    enabled: :class:`int`
+        Bits that are now explicitly allowed.
+
+    disabled: :class:`int`
+        Bits that are now explicitly denied.
+
+    defaulted: :class:`int`
+        Bits that are now neither allowed nor denied.
+    """
+
+    target: int
+    enabled: int
+    disabled: int
+    defaulted: int
+
+
+def diff_permissions(before: int, after: int) -> Tuple[int, int]:
+    """
+    Returns the permission bits that were granted and revoked
+    between two permission values.
+    """
+    changed = before ^ after
+    return changed & after, changed & before
+
+
+def diff_ids(before: Iterable[int], after: Iterable[int]) -> Tuple[set, set]:
+    """
+    Returns the ids that were added and removed between two collections.
+    """
+    before, after = set(before), set(after)
+    return after - before, before - after
+
+
+def overwrite_pairs(channel: discord.abc.GuildChannel) -> Dict[int, Tuple[int, int]]:
+    """
+    Returns the raw `(allow, deny)` bitfields of each overwrite on a channel.
+    """
+    return {
+        overwrite.id: (overwrite.allow, overwrite.deny)
+        for overwrite in channel._overwrites
+    }
+
+
+def diff_overwrites(
+    before: Dict[int, Tuple[int, int]], after: Dict[int, Tuple[int, int]]
+) -> Tuple[List[int], List[int], List[PermissionDiff]]:
+    """
+    Compares two sets of overwrites, returning the targets that were
+    added, the targets that were removed and the changed bits of every
+    target that is still present or was added.
+    """
+    added = [target for target in after if target not in before]
+    removed = [target for target in before if target not in after]
+    changed = []
+    for target, (allow, deny) in after.items():
+        old_allow, old_deny = before.get(target, (0, 0))
+        bits = (old_allow ^ allow) | (old_deny ^ deny)
+        if bits:
+            changed.append(
+                PermissionDiff(
+                    target, bits & allow, bits & deny, bits & ~(allow | deny)
+                )
+            )
+
+    return added, removed, changed
+
+
+class BulkExecutor:
+    """
+    Runs one API call per item with bounded concurrency while
+    pacing calls to stay under the global rate limit.
+    -----------------------------
+
+    concurrency: :class:`int`
+        How many calls may be in flight at once.
+
+    rate: :class:`int`
+        How many calls may start within `per` seconds. Per-route
+        limits are still handled by discord.py's HTTP client.
+
+    progress: Optional[Callable]
+        A coroutine function called with `(done, failed, total)` at
+        most every `interval` seconds and once when finished.
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int = 8,
+        rate: int = 40,
+        per: float = 1.0,
+        errors: Tuple[type, ...] = (discord.HTTPException,),
+        progress: Optional[Callable[[int, int, int], Awaitable[Any]]] = None,
+        interval: float = 2.0,
+    ) -> None:
+        self.concurrency = concurrency
+        self.rate = rate
+        self.per = per
+        self.errors = errors
+        self.progress = progress
+        self.interval = interval
+        self.calls: collections.deque[float] = collections.deque()
+        self.reported = 0.0
+
+    async def throttle(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            while self.calls and now - self.calls[0] >= self.per:
+                self.calls.popleft()
+
+            if len(self.calls) < self.rate:
+                self.calls.append(now)
+                return
+
+            await asyncio.sleep(self.per - (now - self.calls[0]))
+
+    async def report(self, done: int, failed: int, total: int, force: bool = False):
+        if self.progress is None:
+            return
+
+        now = asyncio.get_running_loop().time()
+        if force or now - self.reported >= self.interval:
+            self.reported = now
+            try:
+                await self.progress(done, failed, total)
+            except discord.HTTPException:
+                pass
+
+    async def run(
+        self, items: Iterable[Any], action: Callable[[Any], Awaitable[Any]]
+    ) -> Tuple[List[Any], List[Any]]:
+        """
+        |coro|
+
+        Calls `action` for every item, returning the items that
+        succeeded and the items that raised one of `errors`.
+        """
+        items = list(items)
+        done: List[Any] = []
+        failed: List[Any] = []
+        semaphore = asyncio.Semaphore(self.concurrency)
+        self.reported = asyncio.get_running_loop().time()
+
+        async def call(item: Any) -> None:
+            async with semaphore:
+                await self.throttle()
+                try:
+                    await action(item)
+                except self.errors:
+                    failed.append(item)
+                else:
+                    done.append(item)
+
+            await self.report(len(done), len(failed), len(items))
+
+        await asyncio.gather(*(call(item) for item in items))
+        await self.report(len(done), len(failed), len(items), force=True)
+        return done, failed
+
+
+def node_penalty(node: wavelink.Node) -> float:
+    """
+    Scores how loaded a node is with wavelink's own
+    :class:`wavelink.stats.Penalty`, falling back to its player count
+    until the node has reported stats. Nodes with a lower penalty
+    should be preferred.
+    """
+    stats = getattr(node, "stats", None)
+    if stats is None:
+        return float(len(node.players))
+
+    return wavelink.stats.Penalty(stats).total
+
+
+def best_node(
+    nodes: Iterable[wavelink.Node],
+    region: Optional[str] = None,
+    exclude: Iterable[wavelink.Node] = (),
+) -> wavelink.Node:
+    """
+    Returns the connected node with the lowest penalty, preferring
+    nodes configured for `region` when any of them are available.
+    """
+    exclude = tuple(exclude)
+    candidates = [node for node in nodes if node.is_connected() and node not in exclude]
+    if region:
+        region = region.lower().replace("-", "_")
+        regional = [
+            node
+            for node in candidates
+            if (node.region or "").lower().replace("-", "_") == region
+        ]
+        candidates = regional or candidates
+
+    if not candidates:
+        raise commands.CommandError("No music nodes are available right now.")
+
+    return min(candidates, key=node_penalty)
+
+
+class TrackURL(NamedTuple):
+    """
+    A classified music url.
+    -----------------------------
+
+    source: :class:`str`
+        One of `youtube`, `spotify` or `soundcloud`.
+
+    kind: :class:`str`
+        One of `track`, `playlist` or `album`.
+
+    id: Optional[:class:`str`]
+        The track id, or the playlist/album id for Spotify.
+        SoundCloud ids are the path of the url.
+
+    playlist_id: Optional[:class:`str`]
+        The playlist a YouTube track was linked from.
+
+    index: Optional[:class:`int`]
+        The position in `playlist_id` the link points to.
+    """
+
+    source: str
+    kind: str
+    id: Optional[str]
+    playlist_id: Optional[str] = None
+    index: Optional[int] = None
+
+
+youtube_hosts = frozenset(
+    {
+        "youtube.com",
+        "www.youtube.com",
+        "m.youtube.com",
+        "music.youtube.com",
+        "youtube-nocookie.com",
+        "www.youtube-nocookie.com",
+    }
 )
-soundcloud_regex = re.compile(
-    r"^(?:(https?):\/\/)?(?:(?:www|m)\.)?(soundcloud\.com|snd\.sc)\/(.*)([&?]si=([^&]+))$"
+youtube_paths = ("embed", "v", "shorts", "live")
+spotify_hosts = frozenset({"open.spotify.com", "play.spotify.com"})
+spotify_kinds = frozenset({"track", "album", "playlist"})
+soundcloud_hosts = frozenset(
+    {"soundcloud.com", "www.soundcloud.com", "m.soundcloud.com", "snd.sc"}
 )
 
 
+def query_params(query: str) -> Dict[str, str]:
+    """
+    A lighter :func:`urllib.parse.parse_qs` that keeps the first value of
+    each key and only unquotes values that contain escapes.
+    """
+    params: Dict[str, str] = {}
+    for pair in query.split("&"):
+        key, _, value = pair.partition("=")
+        if key not in params:
+            params[key] = unquote(value) if "%" in value else value
+
+    return params
+
+
+def classify_url(argument: str) -> Optional[TrackURL]:
+    """
+    Returns a :class:`TrackURL` for YouTube, Spotify and SoundCloud
+    urls, or `None` when the argument should be treated as a search.
+    """
+    argument = argument.strip()
+    if argument.startswith("spotify:"):
+        parts = argument.split(":")
+        if len(parts) == 3 and parts[1] in spotify_kinds and parts[2]:
+            return TrackURL("spotify", parts[1], parts[2])
+
+        return None
+
+    if " " in argument or "." not in argument:
+        return None
+
+    if "://" not in argument:
+        argument = "https://" + argument
+
+    try:
+        url = urlsplit(argument)
+        host = url.hostname
+    except ValueError:
+        return None
+
+    segments = [segment for segment in url.path.split("/") if segment]
+
+    if host == "youtu.be" or host in youtube_hosts:
+        query = query_params(url.query)
+        track_id = None
+        if host == "youtu.be":
+            track_id = segments[0] if segments else None
+
+        elif segments and segments[0] == "watch":
+            track_id = query.get("v")
+
+        elif len(segments) >= 2 and segments[0] in youtube_paths:
+            track_id = segments[1]
+
+        playlist_id = query.get("list") or None
+        index = query.get("index", "")
+        index = int(index) if index.isdigit() else None
+
+        if track_id:
+            return TrackURL("youtube", "track", track_id, playlist_id, index)
+
+        if playlist_id:
+            return TrackURL("youtube", "playlist", None, playlist_id, index)
+
+        return None
+
+    if host in spotify_hosts:
+        if segments and segments[0].startswith("intl-"):
+            segments = segments[1:]
+
+        if len(segments) >= 2 and segments[0] in spotify_kinds:
+            return TrackURL("spotify", segments[0], segments[1])
+
+        return None
+
+    if host in soundcloud_hosts:
+        if not segments:
+            return None
+
+        kind = "playlist" if len(segments) >= 3 and segments[1] == "sets" else "track"
+        return TrackURL("soundcloud", kind, "/".join(segments))
+
+    return None
+
+
 class SoundcloudPlaylist(wavelink.abc.Playlist):
     def __init__(self, data: Dict[str, Any]):
-        super().__init__(data)
+        self.data = data
+        self.name = data["playlistInfo"].get("name")
+
+
+class TrackStream:
+    """
+    An ordered stream of playlist tracks that are
+    resolved lazily while the stream is consumed.
+    -----------------------------
+
+    items: Union[Iterable, AsyncIterator]
+        The playlist entries, either already resolved
+        tracks or data that `resolver` turns into tracks.
+
+    resolver: Optional[Callable]
+        A coroutine function resolving a single entry. At most
+        `concurrency` entries are resolved at once, and tracks are
+        yielded in playlist order as soon as they are ready.
+    """
+
+    def __init__(
+        self,
+        items: Union[Iterable, AsyncIterator],
+        resolver: Optional[
+            Callable[[Any], Awaitable[Optional[wavelink.abc.Playable]]]
+        ] = None,
+        *,
+        concurrency: int = 8,
+    ) -> None:
+        self.items = items
+        self.resolver = resolver
+        self.concurrency = concurrency
+
+    async def entries(self) -> AsyncIterator[Any]:
+        if hasattr(self.items, "__aiter__"):
+            async for item in self.items:
+                yield item
+
+        else:
+            for item in self.items:
+                yield item
+
+    async def resolve(self, item: Any) -> Optional[wavelink.abc.Playable]:
+        try:
+            return await self.resolver(item)
+        except Exception:
+            return None
+
+    async def __aiter__(self) -> AsyncIterator[wavelink.abc.Playable]:
+        if self.resolver is None:
+            async for item in self.entries():
+                if item:
+                    yield item
+            return
+
+        pending: collections.deque[asyncio.Task] = collections.deque()
+        try:
+            async for item in self.entries():
+                pending.append(asyncio.ensure_future(self.resolve(item)))
+                if len(pending) >= self.concurrency:
+                    track = await pending.popleft()
+                    if track:
+                        yield track
+
+            while pending:
+                track = await pending.popleft()
+                if track:
+                    yield track
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+async def first_track(
+    node: wavelink.Node, cls: type, query: str
+) -> Optional[wavelink.abc.Playable]:
+    """
+    |coro|
+
+    Loads `query` on a specific node and returns the first
+    track, or `None` when nothing was found.
+    """
+    tracks = await node.get_tracks(cls=cls, query=query)
+    return tracks[0] if tracks else None
+
+
+async def resolve_soundcloud(
+    data: Dict[str, Any], node: Optional[wavelink.Node] = None
+) -> Optional[wavelink.SoundCloudTrack]:
+    """
+    |coro|
+
+    Builds a track from a SoundCloud set entry, only searching
+    for it when Lavalink did not return the encoded track.
+    """
+    if data.get("track"):
+        return wavelink.SoundCloudTrack(data["track"], data["info"])
+
+    return await first_track(
+        node or wavelink.NodePool.get_node(),
+        wavelink.SoundCloudTrack,
+        f"scsearch:{data['info']['title']}",
+    )
+
+
+def serialize_track(track: wavelink.abc.Playable) -> Dict[str, Any]:
+    """
+    Returns a JSON serializable form of a track that
+    :func:`deserialize_track` can rebuild without Lavalink.
+    """
+    if isinstance(track, wavelink.PartialTrack):
+        cls = getattr(track, "_cls", None) or wavelink.YouTubeTrack
+        return {"kind": "PartialTrack", "query": track.query, "cls": cls.__name__}
+
+    return {"kind": type(track).__name__, "id": track.id, "info": track.info}
+
+
+def deserialize_track(data: Dict[str, Any]) -> wavelink.abc.Playable:
+    if data["kind"] == "PartialTrack":
+        return wavelink.PartialTrack(
+            query=data["query"],
+            cls=getattr(wavelink, data["cls"], wavelink.YouTubeTrack),
+        )
+
+    return getattr(wavelink, data["kind"], wavelink.Track)(data["id"], data["info"])
+
+
+class TrackCache:
+    """
+    A least recently used cache of resolved tracks
+    shared across every guild.
+    -----------------------------
+
+    Entries hold the encoded track and its info rather than the
+    track object, so a hit is rebuilt locally without asking
+    Lavalink to load the track again. When a `pool` is given,
+    entries are also written to the database and survive restarts.
+    """
+
+    def __init__(
+        self,
+        pool: Optional[Any] = None,
+        *,
+        maxsize: int = 4096,
+        ttl: datetime.timedelta = datetime.timedelta(hours=12),
+    ) -> None:
+        self.pool = pool
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries: collections.OrderedDict[
+            str, Tuple[str, str, dict, datetime.datetime]
+        ] = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """
+        Urls are kept as-is since ids are case sensitive,
+        while searches are lowercased and have whitespace collapsed.
+        """
+        query = query.strip()
+        if query.startswith(("http://", "https://")):
+            return query
+
+        return " ".join(query.lower().split())
+
+    @staticmethod
+    def build(kind: str, encoded: str, info: dict) -> wavelink.Track:
+        cls = getattr(wavelink, kind, wavelink.Track)
+        return cls(encoded, info)
+
+    async def get(self, query: str) -> Optional[wavelink.Track]:
+        """
+        |coro|
+
+        Returns a cached track for a query or `None` if
+        the query has not been resolved recently.
+        """
+        key = self.normalize(query)
+        entry = self.entries.get(key)
+        if entry is None and self.pool:
+            record = await self.pool.fetchrow(
+                "SELECT kind, track, info, cached FROM tracks WHERE query = $1", key
+            )
+            if record:
+                entry = (
+                    record["kind"],
+                    record["track"],
+                    json.loads(record["info"]),
+                    record["cached"],
+                )
+                self.store(key, entry)
+
+        if entry is None or discord.utils.utcnow() - entry[3] >= self.ttl:
+            self.entries.pop(key, None)
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        kind, encoded, info, _ = entry
+        return self.build(kind, encoded, info)
+
+    async def set(self, query: str, track: wavelink.Track) -> None:
+        """
+        |coro|
+
+        Caches a resolved track for a query.
+        """
+        key = self.normalize(query)
+        entry = (type(track).__name__, track.id, track.info, discord.utils.utcnow())
+        self.store(key, entry)
+
+        if self.pool:
+            await self.pool.execute(
+                "INSERT INTO tracks (query, kind, track, info, cached) VALUES ($1, $2, $3, $4, $5) ON CONFLICT (query) DO UPDATE SET kind = $2, track = $3, info = $4, cached = $5",
+                key,
+                entry[0],
+                entry[1],
+                json.dumps(entry[2]),
+                entry[3],
+            )
+
+    def store(self, key: str, entry: Tuple[str, str, dict, datetime.datetime]) -> None:
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
 
 
 class TrackConverter(commands.Converter):
+    """
+    Returns a track for single songs, or a :class:`TrackStream`
+    for playlists so they can be queued while they resolve.
+
+    Single tracks are looked up in :attr:`Bot.track_cache` first.
+    """
+
     async def convert(
         self, ctx: commands.Context, argument: str
-    ) -> Optional[wavelink.Track]:
+    ) -> Optional[Union[wavelink.Track, TrackStream]]:
 
         async with ctx.typing():
             await ctx.defer()
-            youtube_matches = youtube_regex.findall(argument)
-            spotify_matches = spotify_regex.findall(argument)
-            soundcloud_matches = soundcloud_regex.findall(argument)
+            cache: TrackCache = ctx.bot.track_cache
+            track = await cache.get(argument)
+            if track:
+                return track
 
-            if youtube_matches:
-                matches: Tuple[str] = tuple(
-                    [match for match in youtube_matches[0] if match]
-                )
-
-                if "/watch?v=" in matches and [
-                    match for match in matches if "&list=" in match
-                ]:
-                    playlist_match = matches[-1][6:]
-                    playlist_extras = (
-                        len(playlist_match)
-                        if playlist_match.find("&index=") == -1
-                        else playlist_match.find("&index=")
-                    )
+            result = await self.resolve(ctx, argument)
+            if isinstance(result, wavelink.Track):
+                ctx.bot.loop.create_task(cache.set(argument, result))
 
-                    track_id = matches[-2]
-                    playlist_id = playlist_match[:playlist_extras]
-                    track = await wavelink.YouTubeTrack.search(
-                        query=track_id, return_first=True
-                    )
-                    tracks = await ctx.bot._node.get_playlist(
-                        cls=wavelink.YouTubePlaylist, identifier=playlist_id
-                    )
-                    return track + tracks.tracks
-
-                elif "playlist" in matches:
-                    playlist_id = matches[-1][6:]
-                    tracks: wavelink.tracks.YouTubePlaylist = (
-                        await ctx.bot._node.get_playlist(
-                            cls=wavelink.YouTubePlaylist, identifier=playlist_id
-                        )
-                    )
-                    return tracks.tracks
-
-                elif "/watch?v=" in matches:
-                    matches = list(matches)
-                    id_index = matches.index("/watch?v=") + 1
-                    track_id = matches[id_index]
-                    track = await wavelink.YouTubeTrack.search(
-                        query=track_id, return_first=True
-                    )
-                    return track
+            return result
 
-            elif spotify_matches:
-                matches: Tuple[str] = spotify_matches[0]
+    async def resolve(
+        self, ctx: commands.Context, argument: str
+    ) -> Optional[Union[wavelink.Track, TrackStream]]:
+        """
+        |coro|
+
+        Resolves an argument through Lavalink or Spotify.
+        """
+        url = classify_url(argument)
+        node = best_node(ctx.bot.nodes)
+
+        if url is None:
+            track = await first_track(
+                node, wavelink.YouTubeTrack, f"ytsearch:{argument}"
+            )
+            if track:
+                return track
+
+            return await first_track(
+                node, wavelink.SoundCloudTrack, f"scsearch:{argument}"
+            )
+
+        elif url.source == "youtube":
+            if url.kind == "track" and url.playlist_id:
+                tracks: wavelink.tracks.YouTubePlaylist = await node.get_playlist(
+                    cls=wavelink.YouTubePlaylist,
+                    identifier=f"https://www.youtube.com/watch?v={url.id}&list={url.playlist_id}",
+                )
+                if not tracks:
+                    return None
 
-                if matches[0] == "track":
-                    track_id = matches[-1]
-                    track = await spotify.SpotifyTrack.search(
-                        query=track_id, return_first=True
-                    )
+                selected = getattr(tracks, "selected_track", None)
+                if selected is None or selected < 0:
+                    selected = url.index - 1 if url.index else 0
 
-                elif matches[0] == "album" or matches[0] == "playlist":
-                    playlist_id = matches[-1]
-                    tracks = [
-                        track
-                        async for track in spotify.SpotifyTrack.iterator(
-                            query=playlist_id, partial_tracks=True
-                        )
-                    ]
-                    return tracks
-
-            elif soundcloud_matches:
-                matches: Tuple[str] = soundcloud_matches[0]
-
-                if [match for match in matches if "sets" in match]:
-                    playlist_id = matches[-1]
-                    tracks = await ctx.bot._node.get_playlist(
-                        cls=SoundcloudPlaylist, identifier=argument
-                    )
-                    if tracks:
-                        playlist_tracks = [
-                            await wavelink.SoundCloudTrack.search(
-                                query=track["info"]["title"], return_first=True
-                            )
-                            for track in tracks.data["tracks"]
-                        ]
-                        return playlist_tracks
+                return TrackStream(tracks.tracks[selected:])
 
+            elif url.kind == "playlist":
+                tracks: wavelink.tracks.YouTubePlaylist = await node.get_playlist(
+                    cls=wavelink.YouTubePlaylist,
+                    identifier=f"https://www.youtube.com/playlist?list={url.playlist_id}",
+                )
+                if not tracks:
                     return None
 
-                else:
-                    track_id = matches[-1]
-                    track = await ctx.bot._node.get_tracks(
-                        cls=wavelink.SoundCloudTrack, query=argument
-                    )
-                    return track
+                start = url.index - 1 if url.index else 0
+                return TrackStream(tracks.tracks[start:])
 
-            else:
-                track = await wavelink.YouTubeTrack.convert(ctx, argument)
-                if track:
-                    return track
+            return await first_track(
+                node,
+                wavelink.YouTubeTrack,
+                f"https://www.youtube.com/watch?v={url.id}",
+            )
 
-                track = await wavelink.SoundCloudTrack.convert(ctx, argument)
-                if track:
-                    return track
+        elif url.source == "spotify":
+            if url.kind == "track":
+                tracks = await spotify.SpotifyTrack.search(query=url.id, node=node)
+                return tracks[0] if tracks else None
+
+            return TrackStream(
+                spotify.SpotifyTrack.iterator(
+                    query=url.id, node=node, partial_tracks=True
+                )
+            )
+
+        elif url.source == "soundcloud":
+            identifier = f"https://soundcloud.com/{url.id}"
+            if url.kind == "playlist":
+                tracks = await node.get_playlist(
+                    cls=SoundcloudPlaylist, identifier=identifier
+                )
+                if tracks:
+                    return TrackStream(
+                        tracks.data["tracks"],
+                        functools.partial(resolve_soundcloud, node=node),
+                    )
 
                 return None
+
+            return await first_track(node, wavelink.SoundCloudTrack, identifier)